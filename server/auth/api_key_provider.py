@@ -1,38 +1,79 @@
+import os
 import time
 from typing import Any, Dict
 
+from cache.local_cache import LocalCache
+from cache.negative_cache import is_known_missing, mark_missing
+from cache.single_flight import single_flight
+from dotenv import load_dotenv
 from fastapi import Depends, Request
 from pymongo.database import Database
 from redis_om.model.model import NotFoundError
 
 from module.auth.model.api_key import ApiKeyCache
 
+load_dotenv()
+
+# Per-worker copies of the request.state fields of looked up API keys
+api_key_local_cache = LocalCache(
+    "api_key",
+    max_size=int(os.environ.get("API_KEY_LOCAL_CACHE_MAX_SIZE", 4096)),
+    ttl_s=float(os.environ.get("LOCAL_CACHE_TTL_S", 60)),
+)
+
 
 def populate_api_key_cache(credentials, db):
     api_key_collection = db["api_key"]
     api_key = api_key_collection.find_one({"api_key": credentials})
+    if api_key is None:
+        mark_missing("api_key", credentials)
+        raise NotFoundError
+
     api_key_cache = ApiKeyCache(**api_key)
     api_key_cache.save()
     return api_key_cache
 
 
+def get_cached_key_fields(api_key: ApiKeyCache) -> Dict[str, Any]:
+    return {
+        "active": bool(api_key.active),
+        "api_key_name": api_key.name,
+        "user_id": api_key.user_id,
+        "api_key_id": api_key.id,
+        "api_key_data_tracking": bool(api_key.data_tracking),
+        "api_key_type": api_key.type,
+    }
+
+
 def validate_credentials(credentials: str, request: Request, db: Database) -> bool:
-    try:
-        api_key = ApiKeyCache.get(credentials)
-    except NotFoundError:
+    cached_key = api_key_local_cache.get(credentials)
+    if cached_key is None:
         try:
-            api_key = populate_api_key_cache(credentials, db)
-        except Exception:
-            return False
+            api_key = ApiKeyCache.get(credentials)
+        except NotFoundError:
+            if is_known_missing("api_key", credentials):
+                return False
+
+            try:
+                api_key = single_flight.do(
+                    f"api_key:{credentials}",
+                    lambda: populate_api_key_cache(credentials, db),
+                    recheck=lambda: ApiKeyCache.get(credentials),
+                )
+            except Exception:
+                return False
+
+        cached_key = get_cached_key_fields(api_key)
+        api_key_local_cache.set(credentials, cached_key)
 
-    if not bool(api_key.active):
+    if not cached_key["active"]:
         return False
 
-    request.state.api_key_name = api_key.name
-    request.state.user_id = api_key.user_id
-    request.state.api_key_id = api_key.id
-    request.state.api_key_data_tracking = bool(api_key.data_tracking)
-    request.state.api_key_type = api_key.type
+    request.state.api_key_name = cached_key["api_key_name"]
+    request.state.user_id = cached_key["user_id"]
+    request.state.api_key_id = cached_key["api_key_id"]
+    request.state.api_key_data_tracking = cached_key["api_key_data_tracking"]
+    request.state.api_key_type = cached_key["api_key_type"]
 
     return True
 
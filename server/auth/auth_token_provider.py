@@ -1,8 +1,10 @@
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import jwt
 from bson.objectid import ObjectId
+from cache.invalidation import on_invalidation
+from cache.local_cache import LocalCache
 from dotenv import load_dotenv
 from exception import BaseError
 from fastapi import Request
@@ -12,6 +14,41 @@ from .errors import Errors
 
 load_dotenv()
 
+# Per-worker resolution of (user id, sess_id) to the role and default API key
+session_local_cache = LocalCache(
+    "session",
+    max_size=int(os.environ.get("SESSION_CACHE_MAX_SIZE", 4096)),
+    ttl_s=float(os.environ.get("SESSION_CACHE_TTL_S", 60)),
+)
+
+
+def _invalidate_user_sessions(user_id: Optional[str]):
+    if user_id is None:
+        session_local_cache.clear()
+    else:
+        session_local_cache.delete_where(lambda key: key[0] == user_id)
+
+
+# A changed user invalidates all of their sessions with one message
+on_invalidation("user_sessions", _invalidate_user_sessions)
+
+
+def resolve_session(sess_id: str, user_id: str, db: Database):
+    session = db["session"].find_one({"_id": ObjectId(sess_id)})
+    if not session:
+        return None
+
+    user = db["user"].find_one({"_id": ObjectId(user_id)}, {"role": 1})
+    api_key = db["api_key"].find_one(
+        {"name": "default", "user_id": ObjectId(user_id)}, {"type": 1}
+    )
+
+    return {
+        "role": user["role"] if user else None,
+        "default_api_key_id": api_key["_id"] if api_key else None,
+        "default_api_key_type": api_key["type"] if api_key else None,
+    }
+
 
 def validate_credentials(credentials: str, request: Request, db: Database) -> bool:
     try:
@@ -29,28 +66,27 @@ def validate_credentials(credentials: str, request: Request, db: Database) -> bo
     except Exception:
         return False
 
-    session_collection = db["session"]
-    session = session_collection.find_one({"_id": ObjectId(claims["sess_id"])})
-    if "inference" in request.url.path or "feedback" in request.url.path:
-        user_id = claims["sub"]
-        api_key_collection = db["api_key"]
-        api_key = api_key_collection.find_one(
-            {"name": "default", "user_id": ObjectId(user_id)}
-        )
+    session_key = (claims["sub"], claims["sess_id"])
+    session = session_local_cache.get(session_key)
+    if session is None:
+        session = resolve_session(claims["sess_id"], claims["sub"], db)
+        if not session:
+            return False
+
+        session_local_cache.set(session_key, session)
 
-        if api_key is None:
+    if "inference" in request.url.path or "feedback" in request.url.path:
+        if session["default_api_key_id"] is None:
             raise BaseError(
                 error=Errors.DHRUVA_DEP100.value,
             )
 
-        request.state.api_key_id = api_key["_id"]
-        request.state.api_key_type = api_key["type"]
+        request.state.api_key_id = session["default_api_key_id"]
+        request.state.api_key_type = session["default_api_key_type"]
         request.state.api_key_name = "default"
 
     request.state.user_id = claims["sub"]
-
-    if not session:
-        return False
+    request.state.user_role = session["role"]
 
     return True
 
@@ -13,12 +13,16 @@ class RoleAuthorizationProvider:
         self.roles = roles
 
     def __call__(self, request: Request, db: Database = Depends(AppDatabase)):
-        user_collection = db["user"]
-        user: Dict[str, Any] = user_collection.find_one(
-            {"_id": ObjectId(request.state.user_id)}
-        )  # type: ignore
+        # Already resolved from the session cache for AUTH_TOKEN requests
+        role = getattr(request.state, "user_role", None)
+        if not role:
+            user_collection = db["user"]
+            user: Dict[str, Any] = user_collection.find_one(
+                {"_id": ObjectId(request.state.user_id)}
+            )  # type: ignore
+            role = user["role"]
 
-        user_role = RoleType[user["role"]]
+        user_role = RoleType[role]
 
         if user_role == RoleType.ADMIN:
             return
@@ -0,0 +1,108 @@
+"""
+Compares the FFT resampler AudioService used to rely on with the polyphase
+resampler, both over the whole signal and block by block.
+
+Run from the server directory:
+    python -m benchmarks.resample_benchmark --durations 10 60 600
+"""
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+import scipy.signal as sps
+
+from module.services.utilities.resampling import (
+    polyphase_filter,
+    resample_blocks,
+    resample_ratio,
+)
+
+RATE_PAIRS = [(44100, 16000), (48000, 16000), (8000, 16000), (22050, 16000)]
+
+
+def fft_resample(audio: np.ndarray, sampling_rate: int, target_rate: int):
+    number_of_samples = round(len(audio) * float(target_rate) / sampling_rate)
+    return sps.resample(audio, number_of_samples)
+
+
+def polyphase_resample(audio: np.ndarray, sampling_rate: int, target_rate: int):
+    up, down = resample_ratio(sampling_rate, target_rate)
+    return sps.resample_poly(audio, up, down, window=polyphase_filter(up, down))
+
+
+def blocked_resample(block_size: int) -> Callable:
+    def resample(audio: np.ndarray, sampling_rate: int, target_rate: int):
+        blocks = (audio[i : i + block_size] for i in range(0, len(audio), block_size))
+        return np.concatenate(
+            list(resample_blocks(blocks, sampling_rate, target_rate))
+        )
+
+    return resample
+
+
+def best_of(repeats: int, resample: Callable, *args) -> float:
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        resample(*args)
+        timings.append(time.perf_counter() - start_time)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--durations", type=float, nargs="+", default=[10, 60, 300])
+    parser.add_argument("--block-seconds", type=float, default=30)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'rates':>14} {'secs':>6} {'fft (s)':>9} {'poly (s)':>9} "
+        f"{'blocked (s)':>11} {'speedup':>8} {'max diff':>9}"
+    )
+    for sampling_rate, target_rate in RATE_PAIRS:
+        # Build the cached filter outside of the timed runs
+        up, down = resample_ratio(sampling_rate, target_rate)
+        polyphase_filter(up, down)
+        blocked = blocked_resample(int(args.block_seconds * sampling_rate))
+        passband = sps.butter(
+            8, 0.4 * min(sampling_rate, target_rate), output="sos", fs=sampling_rate
+        )
+
+        for duration in args.durations:
+            # A whole number of `down` steps, so that the FFT resampler lands on
+            # the same output sample times as the polyphase one
+            length = (int(duration * sampling_rate) // down + 1) * down
+            audio = rng.uniform(-1, 1, length)
+            # Keep the test signal inside the passband of both resamplers, as
+            # speech is, so the output difference reflects their accuracy
+            audio = sps.sosfilt(passband, audio).astype(np.float32)
+
+            rates = (sampling_rate, target_rate)
+            fft_s = best_of(args.repeats, fft_resample, audio, *rates)
+            poly_s = best_of(args.repeats, polyphase_resample, audio, *rates)
+            blocked_s = best_of(args.repeats, blocked, audio, *rates)
+
+            # The two methods treat the signal edges differently, so compare
+            # away from them
+            reference = fft_resample(audio, *rates)
+            output = blocked(audio, *rates)
+            margin = target_rate // 10
+            max_diff = np.abs(
+                reference[margin:-margin] - output[margin : len(reference) - margin]
+            ).max()
+
+            print(
+                f"{sampling_rate:>6}->{target_rate:<6} {duration:>6g} {fft_s:>9.3f} "
+                f"{poly_s:>9.3f} {blocked_s:>11.3f} {fft_s / poly_s:>7.1f}x "
+                f"{max_diff:>9.2e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
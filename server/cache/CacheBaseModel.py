@@ -4,7 +4,14 @@ from typing import Optional
 import redis
 from bson import ObjectId
 from bson.int64 import Int64
-from pydantic import Extra, Field, root_validator
+from pydantic import (
+    ConstrainedFloat,
+    ConstrainedInt,
+    ConstrainedStr,
+    Extra,
+    Field,
+    root_validator,
+)
 from redis_om import Field as RedisField
 from redis_om import HashModel
 from redis_om.model.model import PrimaryKey
@@ -45,6 +52,16 @@ class CacheBaseModel(HashModel):
         # Remove all extra fields since overriding Config doesn't seem to work
         all_fields = [v for v in values]
         for v in all_fields:
+            # HashModel saves None as an empty string, read it back as unset
+            if (
+                values[v] == ""
+                and v in cls.__fields__
+                and cls.__fields__[v].allow_none
+                and cls.__fields__[v].type_ is not str
+            ):
+                values.pop(v)
+                continue
+
             if (v not in cls.__fields__ and v != "_id") or (
                 type(values[v]) not in ACCEPTED_FIELD_TYPES
             ):
@@ -68,21 +85,39 @@ class CacheBaseModel(HashModel):
         return values
 
 
+def get_field_type(field):
+    """Constrained types such as conint(gt=0) are cached as their base type"""
+
+    type_ = field.type_
+    if isinstance(type_, type) and issubclass(
+        type_, (ConstrainedInt, ConstrainedFloat, ConstrainedStr)
+    ):
+        return next(base for base in type_.__mro__ if base in ACCEPTED_FIELD_TYPES)
+    return type_
+
+
 def generate_cache_model(cls, primary_key_field):
     model_definition = {}
     for key, value in cls.__fields__.items():
         field = {}
         if key not in EXCLUDED_FIELDS:
+            type_ = get_field_type(value)
             if value.default:
-                field = {key: (value.type_, RedisField(value.default))}
-            elif value.type_ == ObjectId:
+                field = {key: (type_, RedisField(value.default))}
+            elif type_ == ObjectId:
                 field = {key: (str, RedisField(...))}
             elif key == primary_key_field:
                 field = {key: (str, RedisField(..., primary_key=True))}
-            elif value.type_ in ACCEPTED_FIELD_TYPES and not value.sub_fields:
+            elif (
+                type_ in ACCEPTED_FIELD_TYPES
+                and value.allow_none
+                and not value.sub_fields
+            ):
+                field = {key: (Optional[type_], RedisField(None))}
+            elif type_ in ACCEPTED_FIELD_TYPES and not value.sub_fields:
                 # For a list of str value.type_ gives str as result which is misleading
                 # Hence using sub_fields instead to check for complex types
-                field = {key: (value.type_, RedisField(...))}
+                field = {key: (type_, RedisField(...))}
             # Temporary special case for models
             elif key == "task" and cls.__name__ == "Model":
                 field = {"task_type": (str, RedisField(...))}
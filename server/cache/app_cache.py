@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from redis_om import get_redis_connection
@@ -6,10 +7,32 @@ from redis_om import get_redis_connection
 load_dotenv()
 
 
+@lru_cache(maxsize=None)
 def get_cache_connection():
+    # One client and connection pool per process, both are thread-safe
     return get_redis_connection(
         host=os.environ.get("REDIS_HOST"),
         port=os.environ.get("REDIS_PORT"),
         db=os.environ.get("REDIS_DB"),
         password=os.environ.get("REDIS_PASSWORD"),
     )
+
+
+@lru_cache(maxsize=None)
+def get_result_cache_connection():
+    """
+    Redis holding inference results, which ResultCache does not bound in total.
+    Point RESULT_CACHE_REDIS_* at an instance run with maxmemory and the
+    allkeys-lru policy so results only ever evict each other. Without them
+    there is no connection, and results are only cached in process and on disk.
+    """
+
+    if not os.environ.get("RESULT_CACHE_REDIS_HOST"):
+        return None
+
+    return get_redis_connection(
+        host=os.environ.get("RESULT_CACHE_REDIS_HOST"),
+        port=os.environ.get("RESULT_CACHE_REDIS_PORT"),
+        db=os.environ.get("RESULT_CACHE_REDIS_DB"),
+        password=os.environ.get("RESULT_CACHE_REDIS_PASSWORD"),
+    )
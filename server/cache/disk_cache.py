@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class DiskCache:
+    """
+    Stores string values as files named by their key under `directory`,
+    which may be shared by all workers of a node. Once the files add up to
+    more than `max_bytes`, the least recently used ones are removed.
+
+    Each worker keeps an LRU index of the files and their sizes, built from
+    disk at startup and updated as it reads and writes. Files written by
+    other workers enter the index when read, or when eviction rescans the
+    directory, which it does at most every `rescan_interval_s`.
+    """
+
+    def __init__(
+        self, directory: str, max_bytes: int, rescan_interval_s: float = 600
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rescan_interval_s = rescan_interval_s
+
+        os.makedirs(directory, exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__index: "OrderedDict[str, int]" = OrderedDict()
+        self.__total_bytes = 0
+        self.__rescan()
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.__get_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+                size = os.fstat(f.fileno()).st_size
+            # The modification time orders the index rebuilt on restart
+            os.utime(path)
+        except OSError:
+            return None
+
+        with self.__lock:
+            self.__add(path, size)
+        return value
+
+    def set(self, key: str, value: str):
+        data = value.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        path = self.__get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so readers never see partial values
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self.__lock:
+            self.__add(path, len(data))
+            if self.__total_bytes > self.max_bytes:
+                self.__evict()
+
+    def __get_path(self, key: str):
+        return os.path.join(self.directory, key[:2], key)
+
+    def __add(self, path: str, size: int):
+        # Overwriting a file replaces its size rather than adding to it
+        self.__total_bytes += size - self.__index.pop(path, 0)
+        self.__index[path] = size
+
+    def __rescan(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+
+        self.__index = OrderedDict((path, size) for _, path, size in sorted(files))
+        self.__total_bytes = sum(self.__index.values())
+        self.__scanned_at = time.monotonic()
+
+    def __evict(self):
+        # Picks up what other workers sharing the directory wrote or removed
+        if time.monotonic() - self.__scanned_at > self.rescan_interval_s:
+            self.__rescan()
+
+        # Leave some headroom so that eviction does not run on every write
+        target_bytes = self.max_bytes * 0.9
+        while self.__index and self.__total_bytes > target_bytes:
+            path, size = self.__index.popitem(last=False)
+            self.__total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
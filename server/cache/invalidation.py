@@ -0,0 +1,96 @@
+import json
+import threading
+from typing import Callable, Dict, List, Optional
+
+from fastapi.logger import logger
+
+from .app_cache import get_cache_connection
+from .local_cache import local_caches
+
+INVALIDATION_CHANNEL = "Dhruva:invalidate"
+SUBSCRIBE_TIMEOUT_S = 5
+
+# Callbacks by cache name for state derived from cached entries but kept
+# outside of a LocalCache. They are called with the invalidated key, or with
+# None when every key has to be considered invalid.
+invalidation_callbacks: Dict[str, List[Callable[[Optional[str]], None]]] = {}
+
+
+def publish_invalidation(cache_name: str, key: str):
+    """Evicts `key` from the named LocalCache in every worker, this one included"""
+
+    _invalidate(cache_name, key)
+    get_cache_connection().publish(
+        INVALIDATION_CHANNEL, json.dumps({"cache": cache_name, "key": key})
+    )
+
+
+def on_invalidation(cache_name: str, callback: Callable[[Optional[str]], None]):
+    invalidation_callbacks.setdefault(cache_name, []).append(callback)
+
+
+def start_invalidation_listener(
+    subscribe_timeout_s: float = SUBSCRIBE_TIMEOUT_S,
+) -> Callable[[], None]:
+    """
+    Listens in the background, returns once subscribed or after the timeout.
+    The returned function stops the listener and waits for it to exit.
+    """
+
+    subscribed, stopped = threading.Event(), threading.Event()
+    listener = threading.Thread(
+        target=_listen,
+        args=(subscribed, stopped),
+        name="cache-invalidation-listener",
+        daemon=True,
+    )
+    listener.start()
+
+    if not subscribed.wait(subscribe_timeout_s):
+        logger.warning("Cache invalidation listener is not subscribed yet")
+
+    def stop():
+        stopped.set()
+        listener.join()
+
+    return stop
+
+
+def _invalidate(cache_name: str, key: str):
+    local_cache = local_caches.get(cache_name)
+    if local_cache:
+        local_cache.delete(key)
+
+    for callback in invalidation_callbacks.get(cache_name, []):
+        callback(key)
+
+
+def _listen(subscribed: threading.Event, stopped: threading.Event):
+    while not stopped.is_set():
+        try:
+            pubsub = get_cache_connection().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+
+            # Messages published while disconnected are lost, start over clean.
+            # Nothing can be missed before the first subscribe, which happens
+            # before the local caches are warmed up
+            if subscribed.is_set():
+                for local_cache in local_caches.values():
+                    local_cache.clear()
+                for callbacks in invalidation_callbacks.values():
+                    for callback in callbacks:
+                        callback(None)
+            subscribed.set()
+
+            try:
+                # Wakes up every second to check whether it has been stopped
+                while not stopped.is_set():
+                    message = pubsub.get_message(timeout=1)
+                    if message:
+                        data = json.loads(message["data"])
+                        _invalidate(data["cache"], data["key"])
+            finally:
+                pubsub.close()
+        except Exception:
+            logger.exception("Cache invalidation listener disconnected, retrying")
+            stopped.wait(1)
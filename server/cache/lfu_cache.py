@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LFUCache:
+    """
+    Thread-safe, size-bounded cache that evicts the least frequently used
+    entry, and among those the least recently used one. Lookups, inserts and
+    evictions are all O(1).
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+
+        self.__values: Dict[Hashable, Any] = {}
+        self.__counts: Dict[Hashable, int] = {}
+        # Keys by use count, each in least to most recently used order
+        self.__buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self.__min_count = 0
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__values)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.__lock:
+            if key not in self.__values:
+                return None
+
+            self.__touch(key)
+            return self.__values[key]
+
+    def set(self, key: Hashable, value: Any, count: int = 1):
+        """`count` seeds the use count of new entries, e.g. from a frequency list"""
+
+        if self.max_size <= 0:
+            return
+
+        with self.__lock:
+            if key in self.__values:
+                self.__values[key] = value
+                self.__touch(key)
+                return
+
+            if len(self.__values) >= self.max_size:
+                self.__evict()
+
+            self.__values[key] = value
+            self.__counts[key] = count
+            self.__buckets.setdefault(count, OrderedDict())[key] = None
+            self.__min_count = (
+                count if len(self.__values) == 1 else min(self.__min_count, count)
+            )
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]):
+        """Removes every entry whose key matches, in time linear in the size"""
+
+        with self.__lock:
+            for key in [key for key in self.__values if predicate(key)]:
+                self.__remove(key)
+
+    def clear(self):
+        with self.__lock:
+            self.__values.clear()
+            self.__counts.clear()
+            self.__buckets.clear()
+            self.__min_count = 0
+
+    def __remove(self, key: Hashable):
+        count = self.__counts.pop(key)
+        bucket = self.__buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.__buckets[count]
+
+        del self.__values[key]
+
+    def __touch(self, key: Hashable):
+        count = self.__counts[key]
+        bucket = self.__buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.__buckets[count]
+            if self.__min_count == count:
+                self.__min_count = count + 1
+
+        self.__counts[key] = count + 1
+        self.__buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def __evict(self):
+        if self.__min_count not in self.__buckets:
+            self.__min_count = min(self.__buckets)
+
+        bucket = self.__buckets[self.__min_count]
+        key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self.__buckets[self.__min_count]
+
+        del self.__values[key]
+        del self.__counts[key]
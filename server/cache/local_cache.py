@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Every LocalCache by name, so invalidation messages can be routed to them
+local_caches: Dict[str, "LocalCache"] = {}
+
+
+class LocalCache:
+    """
+    Thread-safe, size-bounded LRU cache held in the memory of one worker.
+    Entries expire `ttl_s` seconds after they were set, which bounds how long
+    a worker can serve a stale value if an invalidation message is missed.
+
+    With `max_bytes` set, values must support len() and the cache also
+    evicts least recently used entries once their total length exceeds it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int,
+        ttl_s: float,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+
+        self.__entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.__total_bytes = 0
+        self.__lock = threading.Lock()
+
+        local_caches[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at, _ = entry
+            if time.monotonic() > expires_at:
+                self.__pop(key)
+                return None
+
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        size = len(value) if self.max_bytes else 0
+
+        with self.__lock:
+            self.__pop(key)
+            if self.max_bytes and size > self.max_bytes:
+                return
+
+            self.__entries[key] = (value, time.monotonic() + self.ttl_s, size)
+            self.__total_bytes += size
+
+            while len(self.__entries) > self.max_size or (
+                self.max_bytes and self.__total_bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self.__entries.popitem(last=False)
+                self.__total_bytes -= evicted_size
+
+    def delete(self, key: Hashable):
+        with self.__lock:
+            self.__pop(key)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]):
+        with self.__lock:
+            for key in [key for key in self.__entries if predicate(key)]:
+                self.__pop(key)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__total_bytes = 0
+
+    def __pop(self, key: Hashable):
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__total_bytes -= entry[2]
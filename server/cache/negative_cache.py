@@ -0,0 +1,46 @@
+import os
+
+from dotenv import load_dotenv
+
+from .app_cache import get_cache_connection
+from .invalidation import publish_invalidation
+from .local_cache import LocalCache
+
+load_dotenv()
+
+NEGATIVE_CACHE_TTL_S = int(os.environ.get("NEGATIVE_CACHE_TTL_S", 30))
+
+# Ids known not to exist, so repeated lookups for them skip Mongo
+missing_local_cache = LocalCache(
+    "missing",
+    max_size=int(os.environ.get("NEGATIVE_CACHE_MAX_SIZE", 4096)),
+    ttl_s=NEGATIVE_CACHE_TTL_S,
+)
+
+
+def _get_redis_key(cache_key: str):
+    return f"Dhruva:missing:{cache_key}"
+
+
+def is_known_missing(kind: str, key: str) -> bool:
+    cache_key = f"{kind}:{key}"
+    if missing_local_cache.get(cache_key):
+        return True
+
+    if get_cache_connection().exists(_get_redis_key(cache_key)):
+        missing_local_cache.set(cache_key, True)
+        return True
+
+    return False
+
+
+def mark_missing(kind: str, key: str):
+    cache_key = f"{kind}:{key}"
+    missing_local_cache.set(cache_key, True)
+    get_cache_connection().set(_get_redis_key(cache_key), 1, ex=NEGATIVE_CACHE_TTL_S)
+
+
+def clear_missing(kind: str, key: str):
+    cache_key = f"{kind}:{key}"
+    get_cache_connection().delete(_get_redis_key(cache_key))
+    publish_invalidation("missing", cache_key)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from custom_metrics import RESULT_CACHE_HITS, RESULT_CACHE_MISSES
+from fastapi.logger import logger
+
+from .app_cache import get_result_cache_connection
+from .disk_cache import DiskCache
+from .local_cache import LocalCache
+
+
+class ResultCache:
+    """
+    Content-addressed cache of inference outputs with two tiers: an LRU in
+    the memory of each worker and Redis strings that expire after
+    `redis_ttl_s`, shared by all workers. Outputs larger than
+    `max_value_bytes` are not written to Redis, whose total size is bounded
+    by the maxmemory of the result cache instance, see
+    get_result_cache_connection. Without that instance the Redis tier is
+    disabled, as it is with a `redis_ttl_s` of 0.
+
+    With `disk_dir` set, outputs are also kept in a size-bounded directory
+    on the node, which suits large values such as audio.
+
+    Failures of the Redis tier are logged and treated as misses so that a
+    cache outage never fails an inference request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        local_max_size: int,
+        local_ttl_s: float,
+        redis_ttl_s: int,
+        max_value_bytes: int,
+        local_max_bytes: Optional[int] = None,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self.name = name
+        self.redis_ttl_s = redis_ttl_s if get_result_cache_connection() else 0
+        self.max_value_bytes = max_value_bytes
+
+        self.local_cache = LocalCache(
+            f"result:{name}",
+            max_size=local_max_size,
+            ttl_s=local_ttl_s,
+            max_bytes=local_max_bytes,
+        )
+        self.disk_cache = DiskCache(disk_dir, disk_max_bytes) if disk_dir else None
+
+    def make_key(self, *parts: Any) -> str:
+        return hashlib.sha256(
+            json.dumps(parts, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        for key in keys:
+            value = self.local_cache.get(key)
+            if value is not None:
+                found[key] = value
+        RESULT_CACHE_HITS.labels(self.name, "local").inc(len(found))
+
+        remote_keys = [key for key in set(keys) if key not in found]
+        if remote_keys and self.redis_ttl_s > 0:
+            try:
+                values = get_result_cache_connection().mget(  # type: ignore
+                    [self.__get_redis_key(key) for key in remote_keys]
+                )
+            except Exception:
+                logger.exception(f"Reading {self.name} result cache failed")
+                values = [None] * len(remote_keys)
+
+            hits = 0
+            for key, value in zip(remote_keys, values):
+                if value is not None:
+                    found[key] = value
+                    self.local_cache.set(key, value)
+                    hits += 1
+            RESULT_CACHE_HITS.labels(self.name, "redis").inc(hits)
+
+        if self.disk_cache:
+            hits = 0
+            for key in set(keys):
+                if key in found:
+                    continue
+
+                value = self.disk_cache.get(key)
+                if value is not None:
+                    found[key] = value
+                    self.local_cache.set(key, value)
+                    hits += 1
+            RESULT_CACHE_HITS.labels(self.name, "disk").inc(hits)
+
+        RESULT_CACHE_MISSES.labels(self.name).inc(
+            sum(1 for key in keys if key not in found)
+        )
+        return found
+
+    def set_many(self, values: Dict[str, str]):
+        for key, value in values.items():
+            self.local_cache.set(key, value)
+
+        if self.disk_cache:
+            for key, value in values.items():
+                try:
+                    self.disk_cache.set(key, value)
+                except OSError:
+                    logger.exception(f"Writing {self.name} result cache to disk failed")
+
+        if not values or self.redis_ttl_s <= 0:
+            return
+
+        try:
+            redis = get_result_cache_connection()
+            pipeline = redis.pipeline(transaction=False)  # type: ignore
+            for key, value in values.items():
+                if len(value.encode("utf-8")) <= self.max_value_bytes:
+                    pipeline.set(self.__get_redis_key(key), value, ex=self.redis_ttl_s)
+            pipeline.execute()
+        except Exception:
+            logger.exception(f"Writing {self.name} result cache failed")
+
+    def __get_redis_key(self, key: str):
+        return f"Dhruva:result:{self.name}:{key}"
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from dotenv import load_dotenv
+
+from .app_cache import get_cache_connection
+
+load_dotenv()
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent cache-miss loads of the same key. Within a worker
+    only the first caller runs `loader`, the others wait for it and share
+    its result or exception.
+
+    With `redis_lock` enabled, workers also take a short Redis lock per key.
+    A worker that loses the race polls `recheck` until the winner has filled
+    the cache, and runs `loader` itself only if the lock expires or is
+    released without the cache being filled.
+    """
+
+    def __init__(self, redis_lock: bool, lock_ttl_s: float) -> None:
+        self.redis_lock = redis_lock
+        self.lock_ttl_s = lock_ttl_s
+
+        self.__calls: Dict[Hashable, _Call] = {}
+        self.__lock = threading.Lock()
+
+    def do(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        recheck: Optional[Callable[[], Any]] = None,
+    ):
+        with self.__lock:
+            call = self.__calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self.__calls[key] = _Call()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self.load(key, loader, recheck)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.done.set()
+
+    def load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        recheck: Optional[Callable[[], Any]] = None,
+    ):
+        """Runs `loader` under the Redis lock, without coalescing in process"""
+
+        if not self.redis_lock or not recheck:
+            return loader()
+
+        cache = get_cache_connection()
+        lock_key = f"Dhruva:lock:{key}"
+        if cache.set(lock_key, 1, nx=True, px=int(self.lock_ttl_s * 1000)):
+            try:
+                return loader()
+            finally:
+                cache.delete(lock_key)
+
+        deadline = time.monotonic() + self.lock_ttl_s
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            try:
+                return recheck()
+            except Exception:
+                pass
+
+            if not cache.exists(lock_key):
+                break
+
+        return loader()
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines. The load, including any wait for another
+    worker's lock, runs in the default executor so the event loop keeps
+    serving other requests while it blocks.
+
+    The load is not tied to the caller that started it. Every caller awaits
+    it shielded, so any of them may be cancelled without failing the others.
+    """
+
+    def __init__(self, redis_lock: bool, lock_ttl_s: float) -> None:
+        self.__single_flight = SingleFlight(redis_lock, lock_ttl_s)
+
+        # Only touched from the event loop, so no lock is needed
+        self.__calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        recheck: Optional[Callable[[], Any]] = None,
+    ):
+        call = self.__calls.get(key)
+        if call is None:
+            call = self.__calls[key] = asyncio.get_running_loop().run_in_executor(
+                None, self.__single_flight.load, key, loader, recheck
+            )
+            call.add_done_callback(lambda _: self.__finish(key, call))
+
+        return await asyncio.shield(call)
+
+    def __finish(self, key: str, call: asyncio.Future):
+        del self.__calls[key]
+        # Marks the exception as retrieved, every caller may have been cancelled
+        if not call.cancelled():
+            call.exception()
+
+
+# The thread based variant is for sync callers only, such as the auth providers
+# FastAPI runs in its threadpool
+single_flight = SingleFlight(
+    redis_lock=os.environ.get("SINGLE_FLIGHT_REDIS_LOCK", "false").lower() == "true",
+    lock_ttl_s=float(os.environ.get("SINGLE_FLIGHT_LOCK_TTL_S", 5)),
+)
+async_single_flight = AsyncSingleFlight(
+    redis_lock=single_flight.redis_lock, lock_ttl_s=single_flight.lock_ttl_s
+)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+from typing import Any, Callable, List
+
+from fastapi.logger import logger
+from pymongo.database import Database
+
+# module has to be imported before auth, which imports it back
+from module.auth.model.api_key import ApiKeyCache
+from module.auth.repository import ApiKeyRepository
+from module.services.model import ModelCache, ServiceCache
+from module.services.repository import ModelRepository, ServiceRepository
+from module.services.service.inference_service import (
+    model_local_cache,
+    service_local_cache,
+)
+from auth.api_key_provider import api_key_local_cache, get_cached_key_fields
+
+from .app_cache import get_cache_connection
+from .invalidation import start_invalidation_listener
+
+SCHEMA_VERSION_KEY = "Dhruva:cache_schema_version"
+WARM_UP_LOCK_KEY = "Dhruva:lock:warm_up"
+# Held while a worker warms the cache up, expires should that worker die
+WARM_UP_LOCK_TTL_S = 60
+# Set once warmed up, workers restarted in the meantime skip warming up
+WARM_UP_DONE_KEY = "Dhruva:warm_up_done"
+WARM_UP_DONE_TTL_S = 60
+CACHE_MODELS = [ServiceCache, ModelCache, ApiKeyCache]
+
+
+def get_schema_version() -> str:
+    """Changes whenever a field of any of the cached models changes"""
+
+    schema = {
+        cache_model.__name__: {
+            name: str(field.outer_type_)
+            for name, field in cache_model.__fields__.items()
+        }
+        for cache_model in CACHE_MODELS
+    }
+    return hashlib.sha1(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+
+def start_cache(db: Database) -> Callable[[], None]:
+    """
+    Subscribes this worker to cache invalidations and then warms the caches
+    up, so that nothing published while warming up is missed. Returns the
+    function that stops the invalidation listener.
+    """
+
+    stop_invalidation_listener = start_invalidation_listener()
+    warm_up_cache(db)
+    return stop_invalidation_listener
+
+
+def warm_up_cache(db: Database):
+    """
+    Loads all services, models and active API keys into Redis and into the
+    local caches of this worker. Only one worker per restart wave reads them
+    from Mongo and rewrites Redis, the others fill their local caches from
+    Redis on first use. Dhruva keys are dropped only if they were written
+    with an older cache schema, so restarting a pod never empties the shared
+    cache.
+    """
+
+    cache = get_cache_connection()
+    if cache.exists(WARM_UP_DONE_KEY) or not cache.set(
+        WARM_UP_LOCK_KEY, 1, nx=True, ex=WARM_UP_LOCK_TTL_S
+    ):
+        return
+
+    try:
+        services = _to_cache_entries(
+            ServiceRepository(db).find_all(), ServiceCache, "serviceId"
+        )
+        models = _to_cache_entries(
+            ModelRepository(db).find_all(), ModelCache, "modelId"
+        )
+        api_keys = _to_cache_entries(
+            ApiKeyRepository(db).find({"active": True}), ApiKeyCache, "api_key"
+        )
+
+        schema_version = get_schema_version()
+        if cache.get(SCHEMA_VERSION_KEY) != schema_version:
+            _remove_stale_entries(cache)
+            cache.set(SCHEMA_VERSION_KEY, schema_version)
+
+        # add() writes all entries of a model in one pipeline
+        ServiceCache.add(services)
+        ModelCache.add(models)
+        ApiKeyCache.add(api_keys)
+        cache.set(WARM_UP_DONE_KEY, 1, ex=WARM_UP_DONE_TTL_S)
+    finally:
+        cache.delete(WARM_UP_LOCK_KEY)
+
+    for service in services:
+        service_local_cache.set(service.serviceId, service)
+    for model in models:
+        model_local_cache.set(model.modelId, model)
+    for api_key in api_keys:
+        api_key_local_cache.set(api_key.api_key, get_cached_key_fields(api_key))
+
+    logger.info(
+        f"Cache warmed up with {len(services)} services, {len(models)} models and {len(api_keys)} API keys"
+    )
+
+
+def _to_cache_entries(documents: List[Any], cache_model: Callable, key_field: str):
+    entries = []
+    for document in documents:
+        try:
+            entries.append(cache_model(**document.dict()))
+        except Exception:
+            # Left to be populated lazily on first use
+            logger.warning(
+                f"Skipping cache warm-up of {key_field} {getattr(document, key_field, None)}"
+            )
+    return entries
+
+
+def _remove_stale_entries(cache):
+    stale_keys = []
+    for key in cache.scan_iter(match="Dhruva:*", count=1000):
+        if key == WARM_UP_LOCK_KEY:
+            continue
+
+        stale_keys.append(key)
+        if len(stale_keys) >= 1000:
+            cache.unlink(*stale_keys)
+            stale_keys = []
+
+    if stale_keys:
+        cache.unlink(*stale_keys)
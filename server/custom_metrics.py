@@ -29,3 +29,48 @@ INFERENCE_REQUEST_DURATION_SECONDS = Histogram(
         "target_language",
     ),
 )
+
+ASR_BATCH_PADDING_RATIO = Histogram(
+    "dhruva_asr_batch_padding_ratio",
+    "Fraction of each ASR batch tensor taken up by zero padding",
+    registry=registry,
+    labelnames=("inference_service",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+
+RESULT_CACHE_HITS = Counter(
+    "dhruva_result_cache_hits_total",
+    "Inference outputs served from a result cache",
+    registry=registry,
+    labelnames=("cache", "tier"),
+)
+
+RESULT_CACHE_MISSES = Counter(
+    "dhruva_result_cache_misses_total",
+    "Inference outputs not found in a result cache",
+    registry=registry,
+    labelnames=("cache",),
+)
+
+INFERENCE_DEDUP_RATIO = Histogram(
+    "dhruva_inference_dedup_ratio",
+    "Fraction of the inputs of a request that were duplicates of another input",
+    registry=registry,
+    labelnames=("task_type",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+
+AUDIO_DECODE_DURATION_SECONDS = Histogram(
+    "dhruva_audio_decode_duration_seconds",
+    "Time taken to decode and pre-process an uploaded audio file",
+    registry=registry,
+    labelnames=("task_type",),
+)
+
+AUDIO_DECODE_BUFFER_BYTES = Histogram(
+    "dhruva_audio_decode_buffer_bytes",
+    "Largest sample buffer held while decoding an uploaded audio file",
+    registry=registry,
+    labelnames=("task_type",),
+    buckets=(2**16, 2**18, 2**20, 2**22, 2**24, 2**26, 2**28, 2**30),
+)
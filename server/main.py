@@ -1,11 +1,12 @@
+import asyncio
 import os
 from collections import OrderedDict
 from logging.config import dictConfig
 
 import pymongo
-from cache.app_cache import get_cache_connection
+from cache.warm_up import start_cache
 from custom_metrics import *
-from db.database import db_client
+from db.database import AppDatabase, db_client
 from db.metering_database import Base, engine
 from db.populate_db import seed_collection
 from dotenv import load_dotenv
@@ -27,6 +28,8 @@ from fastapi_sqlalchemy import DBSessionMiddleware
 from log.logger import LogConfig
 from middleware import PrometheusGlobalMetricsMiddleware
 from module import *
+from module.services.gateway import async_triton_client_pool, triton_client_pool
+from module.services.service.inference_service import preload_transliteration_memo
 from seq_streamer import StreamingServerTaskSequence
 
 dictConfig(LogConfig().dict())
@@ -83,9 +86,33 @@ async def init_metering_db():
 
 
 @app.on_event("startup")
-async def flush_cache():
-    cache = get_cache_connection()
-    cache.flushall()
+async def init_cache():
+    await asyncio.get_running_loop().run_in_executor(None, start_cache, AppDatabase())
+
+
+@app.on_event("startup")
+async def init_transliteration_memo():
+    preload_file = os.environ.get("TRANSLITERATION_MEMO_PRELOAD_FILE")
+    if preload_file:
+        # Runs in the background, the memo fills lazily until the preload is done
+        preload = asyncio.get_running_loop().run_in_executor(
+            None, preload_transliteration_memo, preload_file
+        )
+        preload.add_done_callback(_log_preload_failure)
+
+
+def _log_preload_failure(preload: asyncio.Future):
+    if not preload.cancelled() and preload.exception():
+        logger.error(
+            "Preloading the transliteration memo failed",
+            exc_info=preload.exception(),
+        )
+
+
+@app.on_event("shutdown")
+async def close_triton_clients():
+    triton_client_pool.close_all()
+    await async_triton_client_pool.close_all()
 
 
 @app.exception_handler(ULCASetApiKeyTrackingClientError)
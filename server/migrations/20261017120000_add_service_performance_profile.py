@@ -0,0 +1,39 @@
+from mongodb_migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    def upgrade(self):
+        result = self.db.service.update_many(
+            {"maxBatchSize": {"$exists": False}},
+            {
+                "$set": {
+                    "maxBatchSize": 32,
+                    "requestTimeoutS": 20,
+                    "vadChunkDurationS": 7,
+                }
+            },
+        )
+        print(
+            f"Acknowledged: {result.acknowledged}, Updated Count: {result.modified_count}"
+        )
+
+        # Whisper is unstable for long audio at high throughput, keep sending one chunk at a time
+        result = self.db.service.update_many(
+            {"serviceId": {"$regex": "whisper"}}, {"$set": {"maxBatchSize": 1}}
+        )
+        print(
+            f"Acknowledged: {result.acknowledged}, Updated Count: {result.modified_count}"
+        )
+
+    def downgrade(self):
+        self.db.service.update_many(
+            {},
+            {
+                "$unset": {
+                    "maxBatchSize": "",
+                    "maxInflightRequests": "",
+                    "requestTimeoutS": "",
+                    "vadChunkDurationS": "",
+                }
+            },
+        )
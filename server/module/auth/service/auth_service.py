@@ -10,6 +10,8 @@ import jwt
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 from bson import ObjectId
+from cache.invalidation import publish_invalidation
+from cache.negative_cache import clear_missing
 from dotenv import load_dotenv
 from exception import ClientError
 from exception.base_error import BaseError
@@ -223,12 +225,14 @@ class AuthService:
             # Cache write
             api_key_cache = ApiKeyCache(**api_key.dict())
             api_key_cache.save()
+            clear_missing("api_key", key)
         except Exception:
             raise BaseError(Errors.DHRUVA204.value, traceback.format_exc())
 
         return key
 
     def __regenerate_api_key(self, existing_api_key: ApiKey):
+        old_key = existing_api_key.api_key
         key = secrets.token_urlsafe(48)
         existing_api_key.api_key = key
         existing_api_key.masked_key = self.__mask_key(key)
@@ -237,9 +241,12 @@ class AuthService:
         try:
             self.api_key_repository.save(existing_api_key)
 
-            # Cache write
+            # Cache write, the old key must stop working right away
             api_key_cache = ApiKeyCache(**existing_api_key.dict())
             api_key_cache.save()
+            ApiKeyCache.delete(old_key)
+            publish_invalidation("api_key", old_key)
+            clear_missing("api_key", key)
         except Exception:
             raise BaseError(Errors.DHRUVA204.value, traceback.format_exc())
 
@@ -372,6 +379,7 @@ class AuthService:
             # Cache write
             api_key_cache = ApiKeyCache(**api_key.dict())
             api_key_cache.save()
+            publish_invalidation("api_key", api_key.api_key)
         except Exception:
             raise BaseError(Errors.DHRUVA211.value, traceback.format_exc())
 
@@ -402,6 +410,7 @@ class AuthService:
             # Cache write
             api_key_cache = ApiKeyCache(**api_key.dict())
             api_key_cache.save()
+            publish_invalidation("api_key", api_key.api_key)
         except Exception:
             raise ULCADeleteApiKeyServerError(
                 Errors.DHRUVA209.value, traceback.format_exc()
@@ -441,6 +450,7 @@ class AuthService:
             # Cache write
             api_key_cache = ApiKeyCache(**api_key.dict())
             api_key_cache.save()
+            publish_invalidation("api_key", api_key.api_key)
         except Exception:
             raise ULCASetApiKeyTrackingServerError(
                 Errors.DHRUVA210.value, traceback.format_exc()
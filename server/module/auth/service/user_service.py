@@ -3,6 +3,7 @@ from typing import List
 
 from argon2 import PasswordHasher
 from bson import ObjectId
+from cache.invalidation import publish_invalidation
 from exception import BaseError, ClientError
 from fastapi import Depends, status
 from schema.auth.common import ApiKeyType
@@ -97,4 +98,13 @@ class UserService:
         except Exception:
             raise BaseError(Errors.DHRUVA212.value, traceback.format_exc())
 
+        self.invalidate_sessions(user.id)
         return user
+
+    def invalidate_sessions(self, user_id: ObjectId):
+        """
+        Workers cache each session along with its user's role, call this after
+        changing a user so their sessions are resolved again
+        """
+
+        publish_invalidation("user_sessions", str(user_id))
@@ -1 +1,3 @@
 from .inference_gateway import InferenceGateway
+from .micro_batcher import MicroBatcher
+from .triton_client_pool import async_triton_client_pool, triton_client_pool
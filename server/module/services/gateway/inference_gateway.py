@@ -1,15 +1,27 @@
+import asyncio
 import traceback
-from typing import Any
+from contextlib import nullcontext
+from typing import Any, Dict, Tuple
+from urllib.parse import quote
 
-import gevent.ssl
+import aiohttp
+import grpc
 import requests
+import tritonclient.grpc as grpc_client
 import tritonclient.http as http_client
 from exception.base_error import BaseError
 from fastapi.logger import logger
 from numpy import block
+from schema.services.common import TritonTransport
+from tritonclient.grpc import service_pb2
 
 from ..error import Errors
 from ..model import Service
+from .triton_client_pool import async_triton_client_pool, triton_client_pool
+
+# Caps concurrent requests per service along with the limit each was made for,
+# so that a changed service profile takes effect on the next request
+inflight_limits: Dict[str, Tuple[int, asyncio.Semaphore]] = {}
 
 
 class InferenceGateway:
@@ -28,6 +40,28 @@ class InferenceGateway:
 
         return response.json()
 
+    async def send_inference_request_async(
+        self,
+        request_body: Any,
+        service: Service,
+    ) -> dict:
+        try:
+            session = async_triton_client_pool.get_client(service.endpoint)
+            async with session.post(
+                service.endpoint,
+                json=request_body.dict(),
+                timeout=aiohttp.ClientTimeout(total=service.requestTimeoutS),
+            ) as res:
+                status_code = res.status
+                response = await res.json(content_type=None)
+        except:
+            raise BaseError(Errors.DHRUVA101.value, traceback.format_exc())
+
+        if status_code >= 400:
+            raise BaseError(Errors.DHRUVA102.value)
+
+        return response
+
     def send_triton_request(
         self,
         url: str,
@@ -35,14 +69,19 @@ class InferenceGateway:
         model_name: str,
         input_list: list,
         output_list: list,
+        transport: str = TritonTransport.HTTP,
+        timeout: float = 20,
     ):
         try:
-            triton_client = http_client.InferenceServerClient(
-                url=url,
-                ssl=True,
-                ssl_context_factory=gevent.ssl._create_default_https_context,  # type: ignore
-                concurrency=20,
-            )
+            triton_client = triton_client_pool.get_client(url, transport)
+
+            if transport == TritonTransport.GRPC:
+                response = triton_client.ModelInfer(
+                    self.__get_grpc_request(model_name, input_list, output_list),
+                    metadata=self.__get_grpc_metadata(headers),
+                    timeout=timeout,
+                )
+                return grpc_client.InferResult(response)
 
             # health_ctx = triton_client.is_server_ready(headers=headers)
             # logger.info("Health ctx: {}".format(health_ctx))
@@ -55,9 +94,144 @@ class InferenceGateway:
                 outputs=output_list,
                 headers=headers,
             )
-            response = response.get_result(block=True, timeout=20)
+            response = response.get_result(block=True, timeout=timeout)
+
+        except:
+            raise BaseError(Errors.DHRUVA101.value, traceback.format_exc())
+
+        return response
+
+    async def send_triton_request_async(
+        self,
+        url: str,
+        headers: dict,
+        model_name: str,
+        input_list: list,
+        output_list: list,
+        transport: str = TritonTransport.HTTP,
+        timeout: float = 20,
+    ):
+        try:
+            if transport == TritonTransport.GRPC:
+                stub = async_triton_client_pool.get_client(url, transport)
+                response = await stub.ModelInfer(
+                    self.__get_grpc_request(model_name, input_list, output_list),
+                    metadata=self.__get_grpc_metadata(headers),
+                    timeout=timeout,
+                )
+                return grpc_client.InferResult(response)
+
+            # Reuse tritonclient's KServe v2 encoding so that the tensors built
+            # by TritonUtilsService work unchanged on the asyncio path
+            (
+                request_body,
+                json_size,
+            ) = http_client.InferenceServerClient.generate_request_body(
+                input_list, outputs=output_list
+            )
+
+            request_headers = dict(headers)
+            if json_size is not None:
+                request_headers["Inference-Header-Content-Length"] = str(json_size)
 
+            session = async_triton_client_pool.get_client(url)
+            async with session.post(
+                f"https://{url.rstrip('/')}/v2/models/{quote(model_name)}/versions/1/infer",
+                data=request_body,
+                headers=request_headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as res:
+                response_body = await res.read()
+                # Triton answers 400 for inputs it rejects, which sending them
+                # again cannot fix
+                if res.status == 400:
+                    raise BaseError(
+                        Errors.DHRUVA102.value,
+                        f"Triton rejected the request: {response_body!r}",
+                    )
+                if res.status >= 400:
+                    raise Exception(
+                        f"Triton responded with status {res.status}: {response_body!r}"
+                    )
+
+                header_length = res.headers.get("Inference-Header-Content-Length")
+                response = http_client.InferenceServerClient.parse_response_body(
+                    response_body,
+                    header_length=int(header_length) if header_length else None,
+                    # aiohttp has already decompressed the body
+                    content_encoding=None,
+                )
+
+        except BaseError:
+            raise
+        except grpc.aio.AioRpcError as exc:
+            # gRPC counterpart of the 400 above
+            if exc.code() == grpc.StatusCode.INVALID_ARGUMENT:
+                raise BaseError(Errors.DHRUVA102.value, traceback.format_exc())
+            raise BaseError(Errors.DHRUVA101.value, traceback.format_exc())
         except:
             raise BaseError(Errors.DHRUVA101.value, traceback.format_exc())
 
         return response
+
+    @staticmethod
+    def is_rejected_request(exc: BaseException) -> bool:
+        """Whether Triton failed a request because of its inputs"""
+
+        return (
+            isinstance(exc, BaseError)
+            and exc.error_kind == Errors.DHRUVA102.value["kind"]
+        )
+
+    def __get_grpc_request(self, model_name: str, input_list: list, output_list: list):
+        """
+        Builds a gRPC ModelInferRequest from the HTTP tensors produced by
+        TritonUtilsService, so callers stay transport agnostic. HTTP inputs
+        set with binary_data=True already hold the raw tensor bytes in the
+        same layout gRPC expects in raw_input_contents.
+        """
+
+        request = service_pb2.ModelInferRequest(
+            model_name=model_name, model_version="1"
+        )
+        for infer_input in input_list:
+            raw_data = infer_input._get_binary_data()
+            if raw_data is None:
+                raise ValueError(
+                    f"Input {infer_input.name()} must be set with binary_data=True"
+                )
+
+            tensor = request.inputs.add()
+            tensor.name = infer_input.name()
+            tensor.datatype = infer_input.datatype()
+            tensor.shape.extend(infer_input.shape())
+            request.raw_input_contents.append(raw_data)
+
+        for infer_output in output_list:
+            request.outputs.add().name = infer_output.name()
+
+        return request
+
+    def inflight_limit(self, service: Service):
+        """
+        Slot under the service's maxInflightRequests for callers to hold around
+        a request. Enter it before starting any latency timer, so that time
+        spent queueing is not reported as model latency. Services without a
+        limit are not throttled.
+        """
+
+        if not service.maxInflightRequests:
+            inflight_limits.pop(service.serviceId, None)
+            return nullcontext()
+
+        limit, semaphore = inflight_limits.get(service.serviceId, (None, None))
+        if limit != service.maxInflightRequests:
+            # Requests already holding the old slots finish under the old limit
+            limit = service.maxInflightRequests
+            semaphore = asyncio.Semaphore(limit)
+            inflight_limits[service.serviceId] = (limit, semaphore)
+        return semaphore
+
+    def __get_grpc_metadata(self, headers: dict):
+        # gRPC metadata keys must be lowercase
+        return [(key.lower(), value) for key, value in headers.items()]
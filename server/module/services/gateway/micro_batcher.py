@@ -0,0 +1,131 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+
+RunBatch = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class _PendingBatch:
+    def __init__(self, run_batch: RunBatch) -> None:
+        self.run_batch = run_batch
+        self.items: List[Any] = []
+        # (offset into items, number of items, future of the submitter)
+        self.requests: List[Tuple[int, int, asyncio.Future]] = []
+        self.timer: asyncio.TimerHandle = None  # type: ignore
+
+
+class MicroBatcher:
+    """
+    Merges items submitted concurrently under the same key into a single
+    batch, which is sent once it holds the submitter's `max_batch_size`
+    items or `max_wait_ms` has passed since its first item arrived. Each submitter
+    gets back the slice of outputs matching its own items.
+
+    `run_batch` must return exactly one output per input item, in order.
+    All submitters sharing a key are expected to pass equivalent callables
+    that do not depend on the submitter; the one given by the first
+    submitter of a batch is used to send it.
+
+    A failed batch fails all of its submitters at once, unless
+    `is_input_error` says the error was caused by the inputs. Then each
+    submitter's items are retried on their own, so that one bad input only
+    fails the request it came from.
+    """
+
+    def __init__(
+        self,
+        max_wait_ms: float,
+        is_input_error: Callable[[Exception], bool] = lambda exc: False,
+    ) -> None:
+        self.max_wait_ms = max_wait_ms
+        self.is_input_error = is_input_error
+
+        self.__pending: Dict[Hashable, _PendingBatch] = {}
+        # The event loop only keeps weak references to tasks
+        self.__running: Set[asyncio.Future] = set()
+
+    async def submit(
+        self,
+        key: Hashable,
+        items: List[Any],
+        run_batch: RunBatch,
+        max_batch_size: int,
+    ):
+        if not items:
+            return []
+
+        # Nothing to gain from waiting when batching is off or the request
+        # already fills a batch on its own
+        if self.max_wait_ms <= 0 or len(items) >= max_batch_size:
+            return await run_batch(items)
+
+        loop = asyncio.get_running_loop()
+
+        batch = self.__pending.get(key)
+        if batch and len(batch.items) + len(items) > max_batch_size:
+            self.__flush(key, batch)
+            batch = None
+
+        if not batch:
+            batch = _PendingBatch(run_batch)
+            batch.timer = loop.call_later(
+                self.max_wait_ms / 1000, self.__flush, key, batch
+            )
+            self.__pending[key] = batch
+
+        future = loop.create_future()
+        batch.requests.append((len(batch.items), len(items), future))
+        batch.items.extend(items)
+
+        if len(batch.items) >= max_batch_size:
+            self.__flush(key, batch)
+
+        return await future
+
+    def __flush(self, key: Hashable, batch: _PendingBatch):
+        if self.__pending.get(key) is batch:
+            del self.__pending[key]
+        batch.timer.cancel()
+
+        task = asyncio.ensure_future(self.__run(batch))
+        self.__running.add(task)
+        task.add_done_callback(self.__running.discard)
+
+    async def __run(self, batch: _PendingBatch):
+        try:
+            outputs = await batch.run_batch(batch.items)
+        except Exception as exc:
+            if len(batch.requests) > 1 and self.is_input_error(exc):
+                await asyncio.gather(
+                    *[
+                        self.__run_alone(batch, offset, count, future)
+                        for offset, count, future in batch.requests
+                    ]
+                )
+                return
+
+            # Retrying would only hit an unavailable model once per submitter
+            for _, _, future in batch.requests:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for offset, count, future in batch.requests:
+            # The submitter may have been cancelled, e.g. on client disconnect
+            if not future.done():
+                future.set_result(outputs[offset : offset + count])
+
+    async def __run_alone(
+        self, batch: _PendingBatch, offset: int, count: int, future: asyncio.Future
+    ):
+        if future.done():
+            return
+
+        try:
+            outputs = await batch.run_batch(batch.items[offset : offset + count])
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+            return
+
+        if not future.done():
+            future.set_result(outputs)
@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+import aiohttp
+import gevent.ssl
+import grpc
+import tritonclient.http as http_client
+from dotenv import load_dotenv
+from schema.services.common import TritonTransport
+from tritonclient.grpc import service_pb2_grpc
+
+load_dotenv()
+
+# Audio batches easily exceed gRPC's default 4MB message limit
+GRPC_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_permit_without_calls", 1),
+]
+
+
+class TritonClientPool:
+    """
+    Process-wide registry of Triton clients keyed by transport and endpoint URL.
+
+    Each HTTP client owns a keep-alive connection pool of `pool_size`
+    connections and each gRPC client a single multiplexed channel, so repeated
+    calls to the same endpoint reuse warm TLS connections instead of doing a
+    fresh handshake per request. Clients that have not been used for
+    `idle_timeout_s` seconds are closed on the next lookup.
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        idle_timeout_s: float,
+        connection_timeout_s: float,
+        network_timeout_s: float,
+    ) -> None:
+        self.pool_size = pool_size
+        self.idle_timeout_s = idle_timeout_s
+        self.connection_timeout_s = connection_timeout_s
+        self.network_timeout_s = network_timeout_s
+
+        self.__clients: Dict[Tuple[str, str], Tuple[Any, Callable, float]] = {}
+        self.__lock = threading.Lock()
+
+    def get_client(self, url: str, transport: str = TritonTransport.HTTP):
+        """
+        Returns a tritonclient.http.InferenceServerClient for HTTP endpoints
+        and a GRPCInferenceServiceStub for gRPC endpoints.
+        """
+
+        key = (TritonTransport(transport).value, url)
+        now = time.monotonic()
+        with self.__lock:
+            self.__evict_idle_clients(now)
+
+            entry = self.__clients.get(key)
+            client, close = entry[:2] if entry else self.__create_client(*key)
+            self.__clients[key] = (client, close, now)
+
+        return client
+
+    def close_all(self):
+        with self.__lock:
+            closers = [close for _, close, _ in self.__clients.values()]
+            self.__clients.clear()
+
+        for close in closers:
+            self.__close_client(close)
+
+    def __create_client(self, transport: str, url: str) -> Tuple[Any, Callable]:
+        if transport == TritonTransport.GRPC:
+            channel = grpc.secure_channel(
+                url, grpc.ssl_channel_credentials(), options=GRPC_CHANNEL_OPTIONS
+            )
+            return service_pb2_grpc.GRPCInferenceServiceStub(channel), channel.close
+
+        client = http_client.InferenceServerClient(
+            url=url,
+            ssl=True,
+            ssl_context_factory=gevent.ssl._create_default_https_context,  # type: ignore
+            concurrency=self.pool_size,
+            connection_timeout=self.connection_timeout_s,
+            network_timeout=self.network_timeout_s,
+        )
+        return client, client.close
+
+    def __evict_idle_clients(self, now: float):
+        idle_keys = [
+            key
+            for key, (_, _, last_used) in self.__clients.items()
+            if now - last_used > self.idle_timeout_s
+        ]
+        for key in idle_keys:
+            _, close, _ = self.__clients.pop(key)
+            self.__close_client(close)
+
+    def __close_client(self, close: Callable):
+        try:
+            close()
+        except Exception:
+            # The connection may already have been dropped by the server
+            pass
+
+
+class AsyncTritonClientPool:
+    """
+    asyncio counterpart of TritonClientPool, holding one aiohttp session or
+    grpc.aio channel per transport and endpoint URL. Both are bound to the
+    running event loop, so they are created lazily on the first request made
+    from inside the loop.
+
+    Sessions and channels stay open for the life of the process, as requests
+    still in flight may be using them. Instead, the sockets underneath are
+    closed once idle for `idle_timeout_s` seconds and reopened on demand.
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        idle_timeout_s: float,
+        connection_timeout_s: float,
+    ) -> None:
+        self.pool_size = pool_size
+        self.idle_timeout_s = idle_timeout_s
+        self.connection_timeout_s = connection_timeout_s
+
+        self.__clients: Dict[Tuple[str, str], Tuple[Any, Callable]] = {}
+
+    def get_client(self, url: str, transport: str = TritonTransport.HTTP):
+        """
+        Returns an aiohttp.ClientSession for HTTP endpoints and a
+        GRPCInferenceServiceStub on a grpc.aio channel for gRPC endpoints.
+        """
+
+        key = (TritonTransport(transport).value, url)
+        if key not in self.__clients:
+            self.__clients[key] = self.__create_client(*key)
+
+        return self.__clients[key][0]
+
+    async def close_all(self):
+        closers = [close for _, close in self.__clients.values()]
+        self.__clients.clear()
+
+        for close in closers:
+            await close()
+
+    def __create_client(self, transport: str, url: str) -> Tuple[Any, Callable]:
+        if transport == TritonTransport.GRPC:
+            channel = grpc.aio.secure_channel(
+                url,
+                grpc.ssl_channel_credentials(),
+                options=GRPC_CHANNEL_OPTIONS
+                + [("grpc.client_idle_timeout_ms", int(self.idle_timeout_s * 1000))],
+            )
+            return service_pb2_grpc.GRPCInferenceServiceStub(channel), channel.close
+
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            keepalive_timeout=self.idle_timeout_s,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(sock_connect=self.connection_timeout_s),
+        )
+        return session, session.close
+
+
+triton_client_pool = TritonClientPool(
+    pool_size=int(os.environ.get("TRITON_CLIENT_POOL_SIZE", 20)),
+    idle_timeout_s=float(os.environ.get("TRITON_CLIENT_IDLE_TIMEOUT_S", 300)),
+    connection_timeout_s=float(os.environ.get("TRITON_CONNECTION_TIMEOUT_S", 60)),
+    network_timeout_s=float(os.environ.get("TRITON_NETWORK_TIMEOUT_S", 60)),
+)
+
+async_triton_client_pool = AsyncTritonClientPool(
+    pool_size=int(os.environ.get("TRITON_ASYNC_CLIENT_POOL_SIZE", 200)),
+    idle_timeout_s=float(os.environ.get("TRITON_CLIENT_IDLE_TIMEOUT_S", 300)),
+    connection_timeout_s=float(os.environ.get("TRITON_CONNECTION_TIMEOUT_S", 60)),
+)
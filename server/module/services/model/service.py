@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field, create_model
+from pydantic import BaseModel, Field, conint, create_model
 
 from cache.CacheBaseModel import CacheBaseModel, generate_cache_model
 from db.MongoBaseModel import MongoBaseModel
@@ -32,6 +32,14 @@ class Service(MongoBaseModel):
     modelId: str
     endpoint: str
     api_key: str
+    # Endpoint must point at Triton's gRPC port when transport is "grpc"
+    transport: str = "http"
+    # Performance profile, tuned per deployment
+    maxBatchSize: conint(gt=0) = 32  # type: ignore
+    # Unbounded unless set
+    maxInflightRequests: Optional[conint(gt=0)] = None  # type: ignore
+    requestTimeoutS: float = 20
+    vadChunkDurationS: float = 7
     healthStatus: Optional[ServiceStatus]
     benchmarks: Optional[Dict[str, List[_Benchmark]]]
 
@@ -1,6 +1,8 @@
 import datetime
 import traceback
 
+from cache.invalidation import publish_invalidation
+from cache.negative_cache import clear_missing
 from exception.base_error import BaseError
 from fastapi import Depends
 from schema.auth.response.get_all_api_keys_response import GetAllApiKeysDetailsResponse
@@ -51,12 +53,22 @@ class AdminService:
 
     def create_service(self, request: ServiceCreateRequest):
         svc = request.dict()
+        # Whisper is unstable for long audio at high throughput, new deployments
+        # send one chunk at a time unless their profile says otherwise
+        if (
+            "whisper" in request.serviceId
+            and "maxBatchSize" not in request.__fields_set__
+        ):
+            svc["maxBatchSize"] = 1
+
         service = Service(**svc)
         insert_id = self.service_repository.insert_one(service)
 
         svc.update({"_id": insert_id})
         cache = ServiceCache(**svc)
         cache.save()
+        publish_invalidation("service", service.serviceId)
+        clear_missing("service", service.serviceId)
         return insert_id
 
     def create_model(self, request: ModelCreateRequest):
@@ -67,6 +79,8 @@ class AdminService:
         mdl.update({"_id": insert_id})
         cache = ModelCache(**mdl)
         cache.save()
+        publish_invalidation("model", model.modelId)
+        clear_missing("model", model.modelId)
         return insert_id
 
     def update_service(self, request: ServiceUpdateRequest):
@@ -81,8 +95,10 @@ class AdminService:
 
         new_cache = ServiceCache(**new_cache)
         new_cache.save()
+        publish_invalidation("service", request.serviceId)
 
-        return self.service_repository.update_one(request.dict())
+        # Fields left out of the request keep their stored value
+        return self.service_repository.update_one(request.dict(exclude_none=True))
 
     def update_model(self, request: ModelUpdateRequest):
         cache = ModelCache.get(request.modelId)
@@ -96,15 +112,18 @@ class AdminService:
 
         new_cache = ModelCache(**new_cache)
         new_cache.save()
+        publish_invalidation("model", request.modelId)
 
         return self.model_repository.update_one(request.dict())
 
     def delete_service(self, id):
         ServiceCache.delete(id)
+        publish_invalidation("service", id)
         return self.service_repository.delete_one(id)
 
     def delete_model(self, id):
         ModelCache.delete(id)
+        publish_invalidation("model", id)
         return self.model_repository.delete_one(id)
 
     def inference_service_status(self, request_body: ServiceHeartbeatRequest):
@@ -2,20 +2,42 @@ import json
 import os
 import subprocess
 import tempfile
-from typing import Dict, List, Tuple
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 from urllib.request import urlopen
 
 import numpy as np
 import scipy.signal as sps
+import soundfile as sf
 import torch
 import tritonclient.http as http_client
+from dotenv import load_dotenv
 from fastapi import Depends
-from pydub import AudioSegment
-from pydub.effects import normalize as pydub_normalize
 
 from ..gateway import InferenceGateway
+from ..utilities.energy_vad import energy_vad_timestamps
+from ..utilities.resampling import (
+    PolyphaseResampler,
+    polyphase_filter,
+    resample_blocks,
+    resample_ratio,
+)
+from ..utilities.vad_backend import select_vad_backend
 from .triton_utils_service import TritonUtilsService
 
+load_dotenv()
+
+# "polyphase" or "fft", the latter being scipy.signal.resample over the whole signal
+RESAMPLE_METHOD = os.environ.get("AUDIO_RESAMPLE_METHOD", "polyphase")
+# "peak" or "rms"
+NORMALIZE_METHOD = os.environ.get("AUDIO_NORMALIZE_METHOD", "peak")
+NORMALIZE_RMS_TARGET_DBFS = float(
+    os.environ.get("AUDIO_NORMALIZE_RMS_TARGET_DBFS", -20)
+)
+# Streamed audio is decoded DECODE_BLOCK_S seconds at a time and handed on in
+# windows of STREAM_WINDOW_S seconds
+DECODE_BLOCK_S = float(os.environ.get("AUDIO_DECODE_BLOCK_S", 10))
+STREAM_WINDOW_S = float(os.environ.get("AUDIO_STREAM_WINDOW_S", 300))
+
 
 class AudioService:
     def __init__(
@@ -28,47 +50,223 @@ class AudioService:
 
     def stereo_to_mono(self, audio: np.ndarray):
         if len(audio.shape) > 1:  # Stereo to mono
-            audio = audio.sum(axis=1) / 2
+            # Accumulate in the input's dtype so float32 audio stays float32
+            audio = audio.sum(axis=1, dtype=audio.dtype)
+            audio *= 0.5
 
         return audio
 
-    def resample_audio(self, audio: np.ndarray, sampling_rate: int, target_rate: int):
-        if sampling_rate != target_rate:
+    def resample_audio(
+        self,
+        audio: np.ndarray,
+        sampling_rate: int,
+        target_rate: int,
+        method: Optional[str] = None,
+        block_size: Optional[int] = None,
+    ):
+        if sampling_rate == target_rate:
+            return audio
+
+        method = method or RESAMPLE_METHOD
+        if method == "fft":
             number_of_samples = round(len(audio) * float(target_rate) / sampling_rate)
 
             # Since the t param is None, it will only return resampled_x
-            audio = sps.resample(audio, number_of_samples)  # type: ignore
+            return sps.resample(audio, number_of_samples)  # type: ignore
 
-        return audio
+        if method != "polyphase":
+            raise ValueError(f"Unknown resampling method: {method}")
+
+        dtype = audio.dtype.name if audio.dtype.kind == "f" else "float32"
+        if not block_size:
+            up, down = resample_ratio(sampling_rate, target_rate)
+            return sps.resample_poly(
+                audio, up, down, window=polyphase_filter(up, down, dtype)
+            )
 
-    def equalize_amplitude(self, audio: np.ndarray, frame_rate: int):
-        # Amplitude Equalization, assuming mono-streamed
-        # TODO-1: Normalize based on a reference audio from MUCS benchmark? Ref: https://stackoverflow.com/a/42496373
-        # TODO-2: Just implement it without pydub? Ref: https://stackoverflow.com/a/61254921
-        audio *= 2**15 - 1  # Quantize to int16
-        audio_segment = AudioSegment(
-            data=audio.astype("int16").tobytes(),
-            sample_width=2,
-            frame_rate=frame_rate,
-            channels=1,
+        blocks = (audio[i : i + block_size] for i in range(0, len(audio), block_size))
+        return np.concatenate(
+            list(resample_blocks(blocks, sampling_rate, target_rate, dtype))
         )
-        equalized_audio = pydub_normalize(audio_segment)
 
-        return equalized_audio
+    def equalize_amplitude(
+        self,
+        audio: np.ndarray,
+        method: Optional[str] = None,
+        headroom_db: float = 0.1,
+        target_rms_dbfs: Optional[float] = None,
+        gain: Optional[float] = None,
+    ):
+        """
+        Scales mono float audio in place so that its peak sits `headroom_db`
+        below full scale, the same gain pydub's normalize applies to the int16
+        samples. With method="rms" the gain instead brings the RMS level to
+        `target_rms_dbfs`, capped so that the peak still keeps its headroom.
 
-    def dequantize_audio(self, audio: AudioSegment):
-        dequantized_audio = np.array(audio.get_array_of_samples()).astype("float64") / (
-            2**15 - 1
-        )
-        return dequantized_audio
+        A `gain` measured beforehand, e.g. over the whole of a streamed file,
+        is applied as is.
+        """
+
+        # TODO: Normalize based on a reference audio from MUCS benchmark? Ref: https://stackoverflow.com/a/42496373
+        if audio.dtype.kind != "f":
+            audio = audio.astype(np.float32)
+
+        if not len(audio):
+            return audio
+
+        if gain is None:
+            # Avoids the temporary array np.abs(audio).max() would allocate
+            peak = max(float(audio.max()), -float(audio.min()))
+            method = method or NORMALIZE_METHOD
+            rms = (
+                np.sqrt(float(np.dot(audio, audio)) / len(audio))
+                if method == "rms"
+                else 0.0
+            )
+            gain = self.normalization_gain(
+                peak, rms, method, headroom_db, target_rms_dbfs
+            )
+
+        if gain != 1:
+            audio *= gain
+        return audio
 
-    def silero_vad_chunking(
+    def normalization_gain(
+        self,
+        peak: float,
+        rms: float,
+        method: Optional[str] = None,
+        headroom_db: float = 0.1,
+        target_rms_dbfs: Optional[float] = None,
+    ) -> float:
+        # pydub leaves silence untouched, and anything quieter than one int16
+        # step quantised to silence before
+        if peak * (2**15 - 1) < 1:
+            return 1.0
+
+        # pydub measures the target against 2**15 but the samples were scaled
+        # by 2**15 - 1 on the way in and out
+        max_gain = 2**15 / (2**15 - 1) * 10 ** (-headroom_db / 20) / peak
+
+        method = method or NORMALIZE_METHOD
+        if method == "peak":
+            return max_gain
+
+        if method != "rms":
+            raise ValueError(f"Unknown normalization method: {method}")
+
+        if target_rms_dbfs is None:
+            target_rms_dbfs = NORMALIZE_RMS_TARGET_DBFS
+        return min(10 ** (target_rms_dbfs / 20) / rms, max_gain)
+
+    def stream_audio(
+        self,
+        file_handle: BinaryIO,
+        target_rate: int,
+        window_s: float = STREAM_WINDOW_S,
+        block_s: float = DECODE_BLOCK_S,
+    ) -> Iterator[np.ndarray]:
+        """
+        Decodes, downmixes, resamples and normalises audio `block_s` seconds at
+        a time, yielding it in windows of `window_s` seconds at `target_rate`.
+        Only the current window and decode block are held in memory.
+
+        Each window is normalised with the gain measured over all the audio up
+        to its end. Audio that fits in one window gets the same gain as a whole
+        file normalisation, and a quiet stretch after louder speech is not
+        boosted on its own.
+        """
+
+        peak, sum_of_squares, length = 0.0, 0.0, 0
+
+        def normalise(window: np.ndarray) -> np.ndarray:
+            nonlocal peak, sum_of_squares, length
+            if len(window):
+                peak = max(peak, float(window.max()), -float(window.min()))
+                sum_of_squares += float(np.dot(window, window))
+                length += len(window)
+
+            gain = self.normalization_gain(
+                peak, np.sqrt(sum_of_squares / max(length, 1))
+            )
+            return self.equalize_amplitude(window, gain=gain)
+
+        with sf.SoundFile(file_handle) as sound_file:
+            block_size = max(int(block_s * sound_file.samplerate), 1)
+            window_size = max(int(window_s * target_rate), 1)
+
+            pending: List[np.ndarray] = []
+            pending_size = 0
+            for audio in self.__decode_blocks(sound_file, block_size, target_rate):
+                pending.append(audio)
+                pending_size += len(audio)
+
+                while pending_size >= window_size:
+                    window = np.concatenate(pending)
+                    # Copied so the yielded window can be freed independently
+                    pending = [window[window_size:].copy()]
+                    pending_size = len(pending[0])
+                    yield normalise(window[:window_size])
+
+            if pending_size:
+                yield normalise(np.concatenate(pending))
+
+    def __decode_blocks(
+        self, sound_file: sf.SoundFile, block_size: int, target_rate: int
+    ) -> Iterator[np.ndarray]:
+        resampler = PolyphaseResampler(sound_file.samplerate, target_rate)
+        for block in sound_file.blocks(block_size, dtype="float32"):
+            yield resampler.process(self.stereo_to_mono(block))
+
+        yield resampler.flush()
+
+    async def silero_vad_chunking(
         self,
         audio: np.ndarray,
         sample_rate: int,
         max_chunk_duration_s: float,
         min_speech_duration_ms: int = 100,
+        backend: Optional[str] = None,
     ) -> Tuple[List[np.ndarray], List[Dict[str, float]]]:
+        speech_timestamps = await self.detect_speech(
+            audio, sample_rate, min_speech_duration_ms, backend
+        )
+
+        if not speech_timestamps:
+            return ([], [])
+
+        adjusted_timestamps = self.adjust_timestamps(
+            speech_timestamps, sample_rate, max_chunk_duration_s
+        )
+
+        audio_chunks: List[np.ndarray] = [
+            audio[timestamps["start"] : timestamps["end"]]
+            for timestamps in adjusted_timestamps
+        ]
+
+        return (audio_chunks, adjusted_timestamps)
+
+    async def detect_speech(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        min_speech_duration_ms: int = 100,
+        backend: Optional[str] = None,
+    ) -> List[Dict[str, float]]:
+        """
+        Returns the speech segments of the audio as {"start", "end"} sample
+        offsets, found with the backend picked by select_vad_backend
+        """
+
+        if select_vad_backend(len(audio), sample_rate, backend) == "energy":
+            return energy_vad_timestamps(
+                audio,
+                sample_rate,
+                min_silence_duration_ms=400,
+                speech_pad_ms=200,
+                min_speech_duration_ms=min_speech_duration_ms,
+            )
+
         inputs, outputs = self.triton_utils_service.get_vad_io_for_triton(
             audio,
             sample_rate,
@@ -81,7 +279,7 @@ class AudioService:
         headers = {
             "Authorization": "Bearer " + os.environ["SPEECH_UTILS_ENDPOINT_API_KEY"]
         }
-        response = self.inference_gateway.send_triton_request(
+        response = await self.inference_gateway.send_triton_request_async(
             url=os.environ["SPEECH_UTILS_ENDPOINT"],
             model_name="vad",
             input_list=inputs,
@@ -96,19 +294,7 @@ class AudioService:
         else:
             speech_timestamps = json.loads(batch_result[0].decode("utf-8"))
 
-        if not speech_timestamps:
-            return ([], [])
-
-        adjusted_timestamps = self.adjust_timestamps(
-            speech_timestamps, sample_rate, max_chunk_duration_s
-        )
-
-        audio_chunks: List[np.ndarray] = [
-            audio[timestamps["start"] : timestamps["end"]]
-            for timestamps in adjusted_timestamps
-        ]
-
-        return (audio_chunks, adjusted_timestamps)
+        return speech_timestamps or []
 
     def download_audio(self, url: str):
         if "youtube.com" in url or "youtu.be" in url or "drive.google.com" in url:
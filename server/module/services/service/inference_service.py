@@ -1,16 +1,43 @@
+import asyncio
 import base64
 import io
 import json
+import os
 import time
 import traceback
+import unicodedata
+from collections import deque
 from copy import deepcopy
-from typing import Any, Dict, List, Tuple, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 import cv2
 
 import numpy as np
+import orjson
 import soundfile as sf
+from cache.invalidation import on_invalidation
+from cache.lfu_cache import LFUCache
+from cache.local_cache import LocalCache
+from cache.negative_cache import is_known_missing, mark_missing
+from cache.result_cache import ResultCache
+from cache.single_flight import async_single_flight
 from celery_backend.tasks import log_data
-from custom_metrics import INFERENCE_REQUEST_COUNT, INFERENCE_REQUEST_DURATION_SECONDS
+from custom_metrics import (
+    AUDIO_DECODE_BUFFER_BYTES,
+    AUDIO_DECODE_DURATION_SECONDS,
+    INFERENCE_REQUEST_COUNT,
+    INFERENCE_REQUEST_DURATION_SECONDS,
+)
+from dotenv import load_dotenv
 from exception.base_error import BaseError
 from exception.client_error import ClientError
 from exception.null_value_error import NullValueError
@@ -60,7 +87,7 @@ from schema.services.response.ulca_vad_inference_response import _ULCATimestamps
 from scipy.io import wavfile
 
 from ..error.errors import Errors
-from ..gateway import InferenceGateway
+from ..gateway import InferenceGateway, MicroBatcher
 from ..model import Model, ModelCache, Service, ServiceCache
 from ..repository import ModelRepository, ServiceRepository
 from .audio_service import AudioService
@@ -68,10 +95,117 @@ from .image_service import ImageService
 from .post_processor_service import PostProcessorService
 from .subtitle_service import SubtitleService
 from .triton_utils_service import TritonUtilsService
+from ..utilities.base64_reader import Base64Reader
+from ..utilities.deduplication import deduplicate, fan_out
 from ..utilities.profanity.profanity_filter import ProfanityFilter
 
+load_dotenv()
+
 profanityFilterObject = ProfanityFilter()
 
+# Merges concurrent translation requests for the same service and language pair
+translation_batcher = MicroBatcher(
+    max_wait_ms=float(os.environ.get("TRANSLATION_BATCH_MAX_WAIT_MS", 5)),
+    is_input_error=InferenceGateway.is_rejected_request,
+)
+
+# Opt-in cache of translations keyed by service, model version, languages and text
+translation_cache = (
+    ResultCache(
+        "translation",
+        local_max_size=int(os.environ.get("TRANSLATION_CACHE_LOCAL_MAX_SIZE", 10000)),
+        local_ttl_s=float(os.environ.get("TRANSLATION_CACHE_LOCAL_TTL_S", 3600)),
+        redis_ttl_s=int(os.environ.get("TRANSLATION_CACHE_REDIS_TTL_S", 86400)),
+        max_value_bytes=int(os.environ.get("TRANSLATION_CACHE_MAX_VALUE_BYTES", 16384)),
+    )
+    if os.environ.get("TRANSLATION_CACHE_ENABLED", "false").lower() == "true"
+    else None
+)
+
+# Opt-in cache of final encoded TTS audio, large clips can be kept on local disk
+tts_cache = (
+    ResultCache(
+        "tts",
+        local_max_size=int(os.environ.get("TTS_CACHE_LOCAL_MAX_SIZE", 10000)),
+        local_ttl_s=float(os.environ.get("TTS_CACHE_LOCAL_TTL_S", 3600)),
+        redis_ttl_s=int(os.environ.get("TTS_CACHE_REDIS_TTL_S", 86400)),
+        max_value_bytes=int(os.environ.get("TTS_CACHE_MAX_VALUE_BYTES", 262144)),
+        local_max_bytes=int(os.environ.get("TTS_CACHE_LOCAL_MAX_BYTES", 268435456)),
+        disk_dir=os.environ.get("TTS_CACHE_DIR") or None,
+        disk_max_bytes=int(os.environ.get("TTS_CACHE_DISK_MAX_BYTES", 4294967296)),
+    )
+    if os.environ.get("TTS_CACHE_ENABLED", "false").lower() == "true"
+    else None
+)
+
+# Word-level transliteration suggestions by (serviceId, model version, source,
+# target, top-k, word), stored joined into one string per word to keep the memo
+# compact
+TRANSLITERATION_MEMO_SEPARATOR = "\x1f"
+transliteration_memo = LFUCache(
+    max_size=int(os.environ.get("TRANSLITERATION_MEMO_MAX_SIZE", 200000))
+)
+
+
+def invalidate_transliteration_memo(service_id: Optional[str]):
+    if service_id is None:
+        transliteration_memo.clear()
+    else:
+        transliteration_memo.delete_where(lambda key: key[0] == service_id)
+
+
+on_invalidation("service", invalidate_transliteration_memo)
+# Memo keys only hold the model version, so any model change clears them all
+on_invalidation("model", lambda model_id: transliteration_memo.clear())
+
+
+def preload_transliteration_memo(path: str):
+    """
+    Seeds the memo from a JSON lines file where each line holds the serviceId,
+    modelVersion, sourceLanguage, targetLanguage, numSuggestions, word, its
+    suggestions and optionally its request count, e.g. aggregated from
+    inference logs.
+    """
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            entry = json.loads(line)
+            transliteration_memo.set(
+                (
+                    entry["serviceId"],
+                    entry["modelVersion"],
+                    entry["sourceLanguage"],
+                    entry["targetLanguage"],
+                    entry.get("numSuggestions"),
+                    entry["word"],
+                ),
+                TRANSLITERATION_MEMO_SEPARATOR.join(entry["suggestions"]),
+                count=int(entry.get("count", 1)),
+            )
+
+
+# Number of ASR transcript lines sent per ITN / punctuation call
+post_processor_batch_size = int(os.environ.get("POST_PROCESSOR_BATCH_SIZE", 32))
+
+# ASR batches of one upload in flight before decoding waits for the oldest
+asr_max_pending_batches = int(os.environ.get("ASR_MAX_PENDING_BATCHES", 4))
+
+# Per-worker copies of ServiceCache / ModelCache entries in front of Redis
+service_local_cache = LocalCache(
+    "service",
+    max_size=int(os.environ.get("LOCAL_CACHE_MAX_SIZE", 1024)),
+    ttl_s=float(os.environ.get("LOCAL_CACHE_TTL_S", 60)),
+)
+model_local_cache = LocalCache(
+    "model",
+    max_size=int(os.environ.get("LOCAL_CACHE_MAX_SIZE", 1024)),
+    ttl_s=float(os.environ.get("LOCAL_CACHE_TTL_S", 60)),
+)
+
+
 def populate_service_cache(serviceId: str, service_repository: ServiceRepository):
     service = service_repository.get_by_service_id(serviceId)
     service_cache = ServiceCache(**service.dict())
@@ -86,31 +220,64 @@ def populate_model_cache(modelId: str, model_repository: ModelRepository):
     return model_cache
 
 
-def validate_service_id(serviceId: str, service_repository):
+async def validate_service_id(serviceId: str, service_repository):
+    service = service_local_cache.get(serviceId)
+    if service is not None:
+        return service
+
+    # Redis and Mongo are read in the executor to keep the event loop free
+    run_blocking = asyncio.get_running_loop().run_in_executor
     try:
-        service = ServiceCache.get(serviceId)
+        service = await run_blocking(None, ServiceCache.get, serviceId)
     except Exception:
+        if await run_blocking(None, is_known_missing, "service", serviceId):
+            raise ClientError(
+                status_code=status.HTTP_404_NOT_FOUND, message="Invalid Service Id"
+            )
+
         try:
-            service = populate_service_cache(serviceId, service_repository)
+            service = await async_single_flight.do(
+                f"service:{serviceId}",
+                lambda: populate_service_cache(serviceId, service_repository),
+                recheck=lambda: ServiceCache.get(serviceId),
+            )
         except NullValueError:
+            await run_blocking(None, mark_missing, "service", serviceId)
             raise ClientError(
                 status_code=status.HTTP_404_NOT_FOUND, message="Invalid Service Id"
             )
         except Exception:
             raise BaseError(Errors.DHRUVA104.value, traceback.format_exc())
 
+    service_local_cache.set(serviceId, service)
     return service
 
 
-def validate_model_id(modelId: str, model_repository):
+async def validate_model_id(modelId: str, model_repository):
+    model = model_local_cache.get(modelId)
+    if model is not None:
+        return model
+
+    run_blocking = asyncio.get_running_loop().run_in_executor
     try:
-        model = ModelCache.get(modelId)
+        model = await run_blocking(None, ModelCache.get, modelId)
     except Exception:
+        if await run_blocking(None, is_known_missing, "model", modelId):
+            raise BaseError(Errors.DHRUVA105.value)
+
         try:
-            model = populate_model_cache(modelId, model_repository)
+            model = await async_single_flight.do(
+                f"model:{modelId}",
+                lambda: populate_model_cache(modelId, model_repository),
+                recheck=lambda: ModelCache.get(modelId),
+            )
+        except NullValueError:
+            await run_blocking(None, mark_missing, "model", modelId)
+            raise BaseError(Errors.DHRUVA105.value, traceback.format_exc())
         except Exception:
             raise BaseError(Errors.DHRUVA105.value, traceback.format_exc())
 
+    model_local_cache.set(modelId, model)
     return model
 
 
@@ -139,8 +306,8 @@ class InferenceService:
         self, request: ULCAInferenceRequest, api_key_name: str, user_id: str
     ) -> ULCAInferenceResponse:
         serviceId = request.config.serviceId
-        service = validate_service_id(serviceId, self.service_repository)
-        model = validate_model_id(service.modelId, self.model_repository)  # type: ignore
+        service = await validate_service_id(serviceId, self.service_repository)
+        model = await validate_model_id(service.modelId, self.model_repository)  # type: ignore
 
         task_type = model.task_type  # type: ignore
         request_body = request.dict()
@@ -202,7 +369,7 @@ class InferenceService:
         if request_body.config.profanityFilter is not None and request_body.config.profanityFilter == False:
             profanityFilter = False
 
-        service: Service = validate_service_id(serviceId, self.service_repository)  # type: ignore
+        service: Service = await validate_service_id(serviceId, self.service_repository)  # type: ignore
         headers = {"Authorization": "Bearer " + service.api_key}
 
         language = request_body.config.language.sourceLanguage
@@ -220,13 +387,9 @@ class InferenceService:
 
         res = ULCAAsrInferenceResponse(output=[])
         for input in request_body.audio:
-            file_bytes = self.__get_audio_bytes(input)
-            file_handle = io.BytesIO(file_bytes)
+            file_handle = self.__open_audio_input(input)
 
-            final_audio = self.__process_audio_input(file_handle, standard_rate)
-
-            # TODO: Specialised chunked inference for Whisper since it is unstable for long audio at high throughput
-            batch_size = 1 if "whisper" in serviceId else 32
+            batch_size = service.maxBatchSize
 
             pre_processors = (
                 []
@@ -234,49 +397,116 @@ class InferenceService:
                 else request_body.config.preProcessors
             )
 
-            (
-                audio_chunks,
-                speech_timestamps,
-            ) = self.__run_asr_pre_processors(final_audio, pre_processors)
-
-            transcript_lines: List[
-                Tuple[Union[str, Dict[str, float]], Dict[str, float]]
-            ] = []
-            for i in range(0, len(audio_chunks), batch_size):
-                batch = audio_chunks[i : i + batch_size]
+            async def run_asr_batch(
+                batch_chunks: List[Tuple[int, np.ndarray, Dict[str, float]]]
+            ):
+                batch = [audio_chunk for _, audio_chunk, _ in batch_chunks]
                 inputs, outputs = self.triton_utils_service.get_asr_io_for_triton(
                     batch, serviceId, language, request_body.config.bestTokenCount
                 )
 
-                with INFERENCE_REQUEST_DURATION_SECONDS.labels(
-                    api_key_name,
-                    user_id,
-                    request_body.config.serviceId,
-                    "asr",
-                    request_body.config.language.sourceLanguage,
-                    None,
-                ).time():
-                    response = self.inference_gateway.send_triton_request(
-                        url=service.endpoint,
-                        model_name=model_name,
-                        input_list=inputs,
-                        output_list=outputs,
-                        headers=headers,
-                    )
+                async with self.inference_gateway.inflight_limit(service):
+                    with INFERENCE_REQUEST_DURATION_SECONDS.labels(
+                        api_key_name,
+                        user_id,
+                        request_body.config.serviceId,
+                        "asr",
+                        request_body.config.language.sourceLanguage,
+                        None,
+                    ).time():
+                        response = (
+                            await self.inference_gateway.send_triton_request_async(
+                                url=service.endpoint,
+                                model_name=model_name,
+                                input_list=inputs,
+                                output_list=outputs,
+                                headers=headers,
+                                transport=service.transport,
+                                timeout=service.requestTimeoutS,
+                            )
+                        )
 
                 encoded_result = response.as_numpy("TRANSCRIPTS")
                 if encoded_result is None:
                     encoded_result = np.array([])
 
-                transcript_lines.extend(
-                    [
-                        (profanityFilterObject.censor_words(request_body.config.language.sourceLanguage,result.decode("utf-8")), speech_timestamps[i + idx])
-                        if profanityFilter == True
-                        else
-                        (result.decode("utf-8"), speech_timestamps[i + idx])
-                        for idx, result in enumerate(encoded_result.tolist())
-                    ]
-                )
+                return [
+                    (chunk_idx, (profanityFilterObject.censor_words(request_body.config.language.sourceLanguage,result.decode("utf-8")), timestamps))
+                    if profanityFilter == True
+                    else
+                    (chunk_idx, (result.decode("utf-8"), timestamps))
+                    for (chunk_idx, _, timestamps), result in zip(batch_chunks, encoded_result.tolist())
+                ]
+
+            # Audio is decoded and chunked one window at a time, and batches are
+            # sent as soon as enough chunks are ready, so a long upload never
+            # has to be held in memory as a whole. Chunks of similar length are
+            # batched together to minimise padding, and transcripts are put back
+            # in timeline order once all batches return.
+            batch_tasks: Deque[asyncio.Future] = deque()
+            batch_results: List[List[Tuple[int, Any]]] = []
+            pending_chunks: List[Tuple[int, np.ndarray, Dict[str, float]]] = []
+            chunk_count = 0
+
+            async def send_batch(batch_chunks):
+                batch_tasks.append(asyncio.ensure_future(run_asr_batch(batch_chunks)))
+                # Decoding waits for the oldest batch once enough are in flight,
+                # which bounds the audio held by batches that are not sent yet
+                if len(batch_tasks) >= asr_max_pending_batches:
+                    batch_results.append(await batch_tasks.popleft())
+
+            windows = self.__stream_audio_input(file_handle, standard_rate)
+            if "vad" not in pre_processors:
+                # Without VAD there are no pauses to cut at, so the clip is
+                # transcribed whole rather than split mid-word between windows
+                clip = [window for _, window in windows]
+                windows = iter([(0, np.concatenate(clip))] if clip else [])
+
+            try:
+                for window_start, window in windows:
+                    (
+                        audio_chunks,
+                        speech_timestamps,
+                    ) = await self.__run_asr_pre_processors(
+                        window, pre_processors, service.vadChunkDurationS
+                    )
+
+                    for audio_chunk, timestamps in zip(audio_chunks, speech_timestamps):
+                        pending_chunks.append(
+                            (
+                                chunk_count,
+                                # VAD chunks are slices, which would keep their
+                                # whole window alive while waiting for a batch
+                                audio_chunk.copy()
+                                if "vad" in pre_processors
+                                else audio_chunk,
+                                self.__offset_timestamps(
+                                    timestamps, window_start, standard_rate
+                                ),
+                            )
+                        )
+                        chunk_count += 1
+
+                    pending_chunks.sort(key=lambda chunk: len(chunk[1]))
+                    while len(pending_chunks) >= batch_size:
+                        await send_batch(pending_chunks[:batch_size])
+                        pending_chunks = pending_chunks[batch_size:]
+
+                for i in range(0, len(pending_chunks), batch_size):
+                    await send_batch(pending_chunks[i : i + batch_size])
+                batch_results.extend(await asyncio.gather(*batch_tasks))
+            except BaseException:
+                for batch_task in batch_tasks:
+                    batch_task.cancel()
+                raise
+
+            indexed_lines = sorted(
+                (line for batch_lines in batch_results for line in batch_lines),
+                key=lambda indexed_line: indexed_line[0],
+            )
+            transcript_lines: List[
+                Tuple[Union[str, Dict[str, float]], Dict[str, float]]
+            ] = [line for _, line in indexed_lines]
 
             transcript_source_lines: List[Tuple[str, Dict[str, float]]] = transcript_lines  # type: ignore
             n_best_tokens: List[_NBestToken] = []
@@ -339,7 +569,7 @@ class InferenceService:
         serviceId = request_body.config.serviceId
         
 
-        service: Service = validate_service_id(serviceId, self.service_repository)  # type: ignore
+        service: Service = await validate_service_id(serviceId, self.service_repository)  # type: ignore
         headers = {"Authorization": "Bearer " + service.api_key}
 
         results = []
@@ -351,20 +581,23 @@ class InferenceService:
 
             inputs, outputs = self.triton_utils_service.get_ocr_io_for_triton(file_bytes, lang_or_langs)
             
-            with INFERENCE_REQUEST_DURATION_SECONDS.labels(
-                api_key_name,
-                user_id,
-                request_body.config.serviceId,
-                "ocr",
-                lang_or_langs[0], # TODO need modification in dashbord for multilingual models
-                None).time():
-                response = self.inference_gateway.send_triton_request(
-                        url=service.endpoint,
-                        model_name="ocr",
-                        input_list=inputs,
-                        output_list=outputs,
-                        headers=headers,
-                    )
+            async with self.inference_gateway.inflight_limit(service):
+                with INFERENCE_REQUEST_DURATION_SECONDS.labels(
+                    api_key_name,
+                    user_id,
+                    request_body.config.serviceId,
+                    "ocr",
+                    lang_or_langs[0], # TODO need modification in dashbord for multilingual models
+                    None).time():
+                    response = await self.inference_gateway.send_triton_request_async(
+                            url=service.endpoint,
+                            model_name="ocr",
+                            input_list=inputs,
+                            output_list=outputs,
+                            headers=headers,
+                            transport=service.transport,
+                            timeout=service.requestTimeoutS,
+                        )
 
             encoded_result = response.as_numpy("OUTPUT_TEXT")
             if encoded_result is None:
@@ -392,7 +625,7 @@ class InferenceService:
 
         serviceId = request_body.config.serviceId
 
-        service: Service = validate_service_id(serviceId, self.service_repository)  # type: ignore
+        service: Service = await validate_service_id(serviceId, self.service_repository)  # type: ignore
         headers = {"Authorization": "Bearer " + service.api_key}
 
         source_lang = request_body.config.language.sourceLanguage
@@ -439,35 +672,88 @@ class InferenceService:
                 for input_text in input_texts
             ]
             
-        inputs, outputs = self.triton_utils_service.get_translation_io_for_triton(
-            input_texts, source_lang, target_lang
-        )
+        async def run_translation_batch(texts: List[str]):
+            inputs, outputs = self.triton_utils_service.get_translation_io_for_triton(
+                texts, source_lang, target_lang
+            )
+            # Timed per batch, as the time requests spend waiting to be batched
+            # or for a free slot is not model latency. A batch may hold the
+            # inputs of several callers, so it is not attributed to any of them
+            async with self.inference_gateway.inflight_limit(service):
+                with INFERENCE_REQUEST_DURATION_SECONDS.labels(
+                    None,
+                    None,
+                    request_body.config.serviceId,
+                    "translation",
+                    request_body.config.language.sourceLanguage,
+                    request_body.config.language.targetLanguage,
+                ).time():
+                    response = await self.inference_gateway.send_triton_request_async(
+                        url=service.endpoint,
+                        model_name="nmt",
+                        input_list=inputs,
+                        output_list=outputs,
+                        headers=headers,
+                        transport=service.transport,
+                        timeout=service.requestTimeoutS,
+                    )
 
-        with INFERENCE_REQUEST_DURATION_SECONDS.labels(
-            api_key_name,
-            user_id,
-            request_body.config.serviceId,
-            "translation",
-            request_body.config.language.sourceLanguage,
-            request_body.config.language.targetLanguage,
-        ).time():
-            response = self.inference_gateway.send_triton_request(
-                url=service.endpoint,
-                model_name="nmt",
-                input_list=inputs,
-                output_list=outputs,
-                headers=headers,
+            encoded_result = response.as_numpy("OUTPUT_TEXT")
+            if encoded_result is None:
+                encoded_result = np.array([])
+
+            return encoded_result.tolist()
+
+        # Repeated strings are translated once and fanned back out at the end
+        unique_texts, positions = deduplicate(input_texts, "translation")
+
+        translations: List[Optional[str]] = [None] * len(unique_texts)
+        cache_keys: List[str] = []
+        if translation_cache:
+            model = await validate_model_id(service.modelId, self.model_repository)
+            cache_keys = [
+                translation_cache.make_key(
+                    serviceId,
+                    model.version,
+                    source_lang,
+                    target_lang,
+                    unicodedata.normalize("NFC", " ".join(input_text.split())),
+                )
+                for input_text in unique_texts
+            ]
+            # Off the event loop, as the Redis tier blocks on the network
+            cached_translations = await asyncio.get_running_loop().run_in_executor(
+                None, translation_cache.get_many, cache_keys
             )
+            translations = [cached_translations.get(key) for key in cache_keys]
 
-        encoded_result = response.as_numpy("OUTPUT_TEXT")
-        if encoded_result is None:
-            encoded_result = np.array([])
+        # Only the inputs missing from the cache are sent to Triton
+        miss_indices = [
+            idx for idx, translation in enumerate(translations) if translation is None
+        ]
+        if miss_indices:
+            output_batch = await translation_batcher.submit(
+                (serviceId, source_lang, target_lang),
+                [unique_texts[idx] for idx in miss_indices],
+                run_translation_batch,
+                max_batch_size=service.maxBatchSize,
+            )
 
-        output_batch = encoded_result.tolist()
+            for idx, result in zip(miss_indices, output_batch):
+                translations[idx] = result[0].decode("utf-8")
+
+            if translation_cache:
+                await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    translation_cache.set_many,
+                    {cache_keys[idx]: translations[idx] for idx in miss_indices},
+                )
+
+        translations = fan_out(translations, positions)
 
         results = []
-        for source_text, result in zip(input_texts, output_batch):
-            results.append({"source": source_text, "target": result[0].decode("utf-8")})
+        for source_text, translation in zip(input_texts, translations):
+            results.append({"source": source_text, "target": translation})
 
         if profanityFilter == True:
             results = [
@@ -494,7 +780,7 @@ class InferenceService:
 
         serviceId = request_body.config.serviceId
 
-        service: Service = validate_service_id(serviceId, self.service_repository)  # type: ignore
+        service: Service = await validate_service_id(serviceId, self.service_repository)  # type: ignore
         headers = {"Authorization": "Bearer " + service.api_key}
 
         results = []
@@ -508,17 +794,20 @@ class InferenceService:
         #         message="Topk is not valid for sentence level",
         #     )
 
-        for input in request_body.input:
-            input_string = input.source.replace("\n", " ").strip()
-            if input_string:
-                print(f"input string : {input_string}")
+        input_strings = [
+            input.source.replace("\n", " ").strip() for input in request_body.input
+        ]
+        input_strings = [input_string for input_string in input_strings if input_string]
+        unique_strings, positions = deduplicate(input_strings, "txt-lang-detection")
 
-                (
-                    inputs,
-                    outputs,
-                ) = self.triton_utils_service.get_txtlangdetection_io_for_triton(
-                    input_string
-                )
+        if unique_strings:
+            (
+                inputs,
+                outputs,
+            ) = self.triton_utils_service.get_txtlangdetection_io_for_triton(
+                unique_strings
+            )
+            async with self.inference_gateway.inflight_limit(service):
                 with INFERENCE_REQUEST_DURATION_SECONDS.labels(
                     api_key_name,
                     user_id,
@@ -527,21 +816,24 @@ class InferenceService:
                     None,
                     None,
                 ).time():
-                    response = self.inference_gateway.send_triton_request(
+                    response = await self.inference_gateway.send_triton_request_async(
                         url=service.endpoint,
                         model_name="txt-lang-detection",
                         input_list=inputs,
                         output_list=outputs,
                         headers=headers,
+                        transport=service.transport,
+                        timeout=service.requestTimeoutS,
                     )
-                print(response)
-                encoded_result = response.as_numpy("OUTPUT_TEXT")
-                
-                str_data = json.dumps(encoded_result[0].decode('utf-8'))
-                json_data = json.loads(str_data)
-                json_data = json.loads(json_data)
-                results.append(json_data["output"][0])
-        
+
+            # Each output is a JSON document per input line
+            encoded_result = response.as_numpy("OUTPUT_TEXT").reshape(-1)
+            detections = [
+                orjson.loads(encoded_output)["output"][0]
+                for encoded_output in encoded_result
+            ]
+            results.extend(fan_out(detections, positions))
+
         return ULCATxtLangDetectionInferenceResponse(output=results)
 
         #         if encoded_result is None:
@@ -575,7 +867,7 @@ class InferenceService:
 
         serviceId = request_body.config.serviceId
 
-        service: Service = validate_service_id(serviceId, self.service_repository)  # type: ignore
+        service: Service = await validate_service_id(serviceId, self.service_repository)  # type: ignore
         headers = {"Authorization": "Bearer " + service.api_key}
 
         results = []
@@ -590,16 +882,53 @@ class InferenceService:
                 message="Topk is not valid for sentence level",
             )
 
-        for input in request_body.input:
-            input_string = input.source.replace("\n", " ").strip()
-            if input_string:
-                (
-                    inputs,
-                    outputs,
-                ) = self.triton_utils_service.get_transliteration_io_for_triton(
-                    input_string, source_lang, target_lang, is_word_level, top_k
+        input_strings = [
+            input.source.replace("\n", " ").strip() for input in request_body.input
+        ]
+
+        unique_strings, positions = deduplicate(input_strings, "transliteration")
+
+        # Empty inputs are echoed back as-is without a Triton call
+        non_empty_indices = [
+            idx for idx, input_string in enumerate(unique_strings) if input_string
+        ]
+        suggestions: Dict[int, List[str]] = {}
+
+        # Keyboard traffic repeats a small set of words, serve those from the memo
+        memo_keys: Dict[int, Tuple[str, str, str, str, Optional[int], str]] = {}
+        if is_word_level and transliteration_memo.max_size > 0:
+            model = await validate_model_id(service.modelId, self.model_repository)
+            for idx in non_empty_indices:
+                memo_keys[idx] = (
+                    serviceId,
+                    model.version,
+                    source_lang,
+                    target_lang,
+                    top_k,
+                    unique_strings[idx],
                 )
+                memo = transliteration_memo.get(memo_keys[idx])
+                if memo is not None:
+                    suggestions[idx] = (
+                        memo.split(TRANSLITERATION_MEMO_SEPARATOR) if memo else []
+                    )
+
+        pending_indices = [idx for idx in non_empty_indices if idx not in suggestions]
 
+        for i in range(0, len(pending_indices), service.maxBatchSize):
+            batch_indices = pending_indices[i : i + service.maxBatchSize]
+            (
+                inputs,
+                outputs,
+            ) = self.triton_utils_service.get_transliteration_io_for_triton(
+                [unique_strings[idx] for idx in batch_indices],
+                source_lang,
+                target_lang,
+                is_word_level,
+                top_k,
+            )
+
+            async with self.inference_gateway.inflight_limit(service):
                 with INFERENCE_REQUEST_DURATION_SECONDS.labels(
                     api_key_name,
                     user_id,
@@ -608,23 +937,36 @@ class InferenceService:
                     request_body.config.language.sourceLanguage,
                     request_body.config.language.targetLanguage,
                 ).time():
-                    response = self.inference_gateway.send_triton_request(
+                    response = await self.inference_gateway.send_triton_request_async(
                         url=service.endpoint,
                         model_name="transliteration",
                         input_list=inputs,
                         output_list=outputs,
                         headers=headers,
+                        transport=service.transport,
+                        timeout=service.requestTimeoutS,
                     )
 
-                encoded_result = response.as_numpy("OUTPUT_TEXT")
-                if encoded_result is None:
-                    encoded_result = np.array([np.array([])])
-
-                result = [r.decode("utf-8") for r in encoded_result.tolist()[0]]
-            else:
-                result = [input_string]
+            encoded_result = response.as_numpy("OUTPUT_TEXT")
+            if encoded_result is None:
+                encoded_result = np.array([np.array([])] * len(batch_indices))
+
+            # One row of top-k suggestions per input of the batch
+            for idx, encoded_row in zip(batch_indices, encoded_result.tolist()):
+                suggestions[idx] = [r.decode("utf-8") for r in encoded_row]
+                if idx in memo_keys:
+                    transliteration_memo.set(
+                        memo_keys[idx],
+                        TRANSLITERATION_MEMO_SEPARATOR.join(suggestions[idx]),
+                    )
 
-            results.append({"source": input_string, "target": result})
+        for input_string, position in zip(input_strings, positions):
+            results.append(
+                {
+                    "source": input_string,
+                    "target": suggestions.get(position, [input_string]),
+                }
+            )
 
         return ULCATransliterationInferenceResponse(output=results)
 
@@ -644,7 +986,7 @@ class InferenceService:
 
         serviceId = request_body.config.serviceId
 
-        service: Service = validate_service_id(serviceId, self.service_repository)  # type: ignore
+        service: Service = await validate_service_id(serviceId, self.service_repository)  # type: ignore
         headers = {"Authorization": "Bearer " + service.api_key}
 
         ip_language = request_body.config.language.sourceLanguage
@@ -665,34 +1007,76 @@ class InferenceService:
         if request_body.config.profanityFilter is not None and request_body.config.profanityFilter == False:
             profanityFilter = False
 
-        results = []
-
+        input_strings = []
         for input in request_body.input:
             input_string = self.__process_tts_input(input.source)
-            
+
             if profanityFilter == True:
                 input_string = profanityFilterObject.censor_words(ip_language,input_string)
 
-            if input_string:
+            input_strings.append(input_string)
+
+        # Repeated prompts are synthesised once and fanned back out at the end
+        unique_strings, positions = deduplicate(input_strings, "tts")
+
+        cache_keys: List[str] = []
+        cached_audio: Dict[str, str] = {}
+        new_audio: Dict[str, str] = {}
+        if tts_cache:
+            model = await validate_model_id(service.modelId, self.model_repository)
+            cache_keys = [
+                tts_cache.make_key(
+                    serviceId,
+                    model.version,
+                    unicodedata.normalize("NFC", " ".join(input_string.split())),
+                    ip_gender,
+                    ip_language,
+                    target_sr,
+                    format,
+                )
+                for input_string in unique_strings
+            ]
+            # Off the event loop, as the Redis and disk tiers block on large clips
+            cached_audio = await asyncio.get_running_loop().run_in_executor(
+                None,
+                tts_cache.get_many,
+                [
+                    key
+                    for key, input_string in zip(cache_keys, unique_strings)
+                    if input_string
+                ],
+            )
+
+        encoded_strings = []
+        for idx, input_string in enumerate(unique_strings):
+            if cache_keys and cache_keys[idx] in cached_audio:
+                # Skips synthesis, resampling and re-encoding altogether
+                encoded_string = cached_audio[cache_keys[idx]]
+            elif input_string:
                 inputs, outputs = self.triton_utils_service.get_tts_io_for_triton(
                     input_string, ip_gender, ip_language
                 )
 
-                with INFERENCE_REQUEST_DURATION_SECONDS.labels(
-                    api_key_name,
-                    user_id,
-                    request_body.config.serviceId,
-                    "tts",
-                    request_body.config.language.sourceLanguage,
-                    None,
-                ).time():
-                    response = self.inference_gateway.send_triton_request(
-                        url=service.endpoint,
-                        model_name="tts",
-                        input_list=inputs,
-                        output_list=outputs,
-                        headers=headers,
-                    )
+                async with self.inference_gateway.inflight_limit(service):
+                    with INFERENCE_REQUEST_DURATION_SECONDS.labels(
+                        api_key_name,
+                        user_id,
+                        request_body.config.serviceId,
+                        "tts",
+                        request_body.config.language.sourceLanguage,
+                        None,
+                    ).time():
+                        response = (
+                            await self.inference_gateway.send_triton_request_async(
+                                url=service.endpoint,
+                                model_name="tts",
+                                input_list=inputs,
+                                output_list=outputs,
+                                headers=headers,
+                                transport=service.transport,
+                                timeout=service.requestTimeoutS,
+                            )
+                        )
 
                 result = response.as_numpy("OUTPUT_GENERATED_AUDIO")
                 if result is None:
@@ -713,10 +1097,23 @@ class InferenceService:
 
                 encoded_bytes = base64.b64encode(byte_io.read())
                 encoded_string = encoded_bytes.decode()
+
+                if cache_keys:
+                    new_audio[cache_keys[idx]] = encoded_string
             else:
                 encoded_string = ""
 
-            results.append(_ULCAAudio(audioContent=encoded_string))
+            encoded_strings.append(encoded_string)
+
+        if tts_cache:
+            await asyncio.get_running_loop().run_in_executor(
+                None, tts_cache.set_many, new_audio
+            )
+
+        results = [
+            _ULCAAudio(audioContent=encoded_string)
+            for encoded_string in fan_out(encoded_strings, positions)
+        ]
 
         base_audio_config = _ULCABaseAudioConfig(
             language=_ULCALanguage(sourceLanguage=ip_language),
@@ -741,21 +1138,22 @@ class InferenceService:
 
         serviceId = request_body.config.serviceId
 
-        service: Service = validate_service_id(serviceId, self.service_repository)  # type: ignore
+        service: Service = await validate_service_id(serviceId, self.service_repository)  # type: ignore
         headers = {"Authorization": "Bearer " + service.api_key}
 
         # TODO: Replace with real deployments
-        with INFERENCE_REQUEST_DURATION_SECONDS.labels(
-            api_key_name,
-            user_id,
-            request_body.config.serviceId,
-            "ner",
-            request_body.config.language.sourceLanguage,
-            None,
-        ).time():
-            res = self.inference_gateway.send_inference_request(
-                request_body=request_body, service=service
-            )
+        async with self.inference_gateway.inflight_limit(service):
+            with INFERENCE_REQUEST_DURATION_SECONDS.labels(
+                api_key_name,
+                user_id,
+                request_body.config.serviceId,
+                "ner",
+                request_body.config.language.sourceLanguage,
+                None,
+            ).time():
+                res = await self.inference_gateway.send_inference_request_async(
+                    request_body=request_body, service=service
+                )
 
         return ULCANerInferenceResponse(**res)
 
@@ -768,7 +1166,7 @@ class InferenceService:
 
         serviceId = request_body.config.serviceId
 
-        service: Service = validate_service_id(serviceId, self.service_repository)  # type: ignore
+        service: Service = await validate_service_id(serviceId, self.service_repository)  # type: ignore
         headers = {"Authorization": "Bearer " + service.api_key}
 
         standard_rate = 16000
@@ -776,11 +1174,13 @@ class InferenceService:
         res = ULCAVadInferenceResponse(output=[])
 
         for input in request_body.audio:
-            file_bytes = self.__get_audio_bytes(input)
-            file_handle = io.BytesIO(file_bytes)
+            file_handle = self.__open_audio_input(input)
 
             final_audio = self.__process_audio_input(
-                file_handle, standard_rate, request_body.config.preProcessAudio
+                file_handle,
+                standard_rate,
+                request_body.config.preProcessAudio,
+                task_type="vad",
             )
 
             inputs, outputs = self.triton_utils_service.get_vad_io_for_triton(
@@ -792,21 +1192,24 @@ class InferenceService:
                 min_speech_duration_ms=request_body.config.minSpeechDurationMs,
             )
 
-            with INFERENCE_REQUEST_DURATION_SECONDS.labels(
-                api_key_name,
-                user_id,
-                request_body.config.serviceId,
-                "vad",
-                None,
-                None,
-            ).time():
-                response = self.inference_gateway.send_triton_request(
-                    url=service.endpoint,
-                    model_name="vad",
-                    input_list=inputs,
-                    output_list=outputs,
-                    headers=headers,
-                )
+            async with self.inference_gateway.inflight_limit(service):
+                with INFERENCE_REQUEST_DURATION_SECONDS.labels(
+                    api_key_name,
+                    user_id,
+                    request_body.config.serviceId,
+                    "vad",
+                    None,
+                    None,
+                ).time():
+                    response = await self.inference_gateway.send_triton_request_async(
+                        url=service.endpoint,
+                        model_name="vad",
+                        input_list=inputs,
+                        output_list=outputs,
+                        headers=headers,
+                        transport=service.transport,
+                        timeout=service.requestTimeoutS,
+                    )
 
             result = response.as_numpy("TIMESTAMPS")
 
@@ -1002,53 +1405,142 @@ class InferenceService:
         return file_bytes
 
 
+    def __open_audio_input(self, input: _ULCAAudio) -> BinaryIO:
+        # Inline audio is decoded from base64 lazily as it is read, as long as
+        # it is plain unwrapped base64
+        if input.audioContent and Base64Reader.is_supported(input.audioContent):
+            return io.BufferedReader(Base64Reader(input.audioContent))
+
+        return io.BytesIO(self.__get_audio_bytes(input))
+
     def __process_audio_input(
-        self, file_handle: io.BytesIO, standard_rate: int, process_audio: bool = True
+        self,
+        file_handle: BinaryIO,
+        standard_rate: int,
+        process_audio: bool = True,
+        task_type: str = "asr",
     ):
-        data, sampling_rate = sf.read(file_handle)
-        data = data.tolist()
-        raw_audio = np.array(data)  # in float64
+        start_time = time.perf_counter()
+
+        # Decode straight into a contiguous float32 buffer, which is the dtype
+        # the Triton audio models take
+        raw_audio, sampling_rate = sf.read(file_handle, dtype="float32")
+        peak_bytes = raw_audio.nbytes
 
         if not process_audio:
-            return raw_audio
+            final_audio = raw_audio
+        else:
+            mono_raw_audio = self.audio_service.stereo_to_mono(raw_audio)
+            del raw_audio
+            resampled_audio = self.audio_service.resample_audio(
+                mono_raw_audio, sampling_rate, standard_rate
+            )
+            peak_bytes = max(peak_bytes, resampled_audio.nbytes)
+            del mono_raw_audio
+            final_audio = self.audio_service.equalize_amplitude(resampled_audio)
 
-        mono_raw_audio = self.audio_service.stereo_to_mono(raw_audio)
-        resampled_audio = self.audio_service.resample_audio(
-            mono_raw_audio, sampling_rate, standard_rate
-        )
-        equalized_audio = self.audio_service.equalize_amplitude(
-            resampled_audio, standard_rate
+        AUDIO_DECODE_DURATION_SECONDS.labels(task_type).observe(
+            time.perf_counter() - start_time
         )
-        final_audio = self.audio_service.dequantize_audio(equalized_audio)
+        AUDIO_DECODE_BUFFER_BYTES.labels(task_type).observe(peak_bytes)
 
         return final_audio
 
+    def __stream_audio_input(
+        self, file_handle: BinaryIO, standard_rate: int, task_type: str = "asr"
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Yields the processed audio window by window along with the offset, in
+        samples, of each window from the start of the audio
+        """
+
+        windows = self.audio_service.stream_audio(file_handle, standard_rate)
+        decode_duration_s, peak_bytes, window_start = 0.0, 0, 0
+        while True:
+            start_time = time.perf_counter()
+            window = next(windows, None)
+            decode_duration_s += time.perf_counter() - start_time
+
+            if window is None:
+                break
+
+            peak_bytes = max(peak_bytes, window.nbytes)
+            yield window_start, window
+            window_start += len(window)
+
+        AUDIO_DECODE_DURATION_SECONDS.labels(task_type).observe(decode_duration_s)
+        AUDIO_DECODE_BUFFER_BYTES.labels(task_type).observe(peak_bytes)
+
+    def __offset_timestamps(
+        self, timestamps: Dict[str, float], offset: int, sample_rate: int
+    ) -> Dict[str, float]:
+        if not offset:
+            return timestamps
+
+        offset_secs = offset / sample_rate
+        return {
+            **timestamps,
+            "start": timestamps["start"] + offset,
+            "start_secs": round(timestamps["start_secs"] + offset_secs, 3),
+            "end": timestamps["end"] + offset,
+            "end_secs": round(timestamps["end_secs"] + offset_secs, 3),
+        }
+
     async def __run_asr_post_processors(
         self,
         transcript_lines: List[Tuple[str, Dict[str, float]]],
         post_processors: List[str],
         source_language: str,
     ):
-        for idx, transcript_line in enumerate(transcript_lines):
-            line = transcript_line[0]
-            if "itn" in post_processors:
-                line = await self.post_processor_service.run_itn(
-                    line,
-                    source_language,
-                )
+        lines = [transcript_line[0] for transcript_line in transcript_lines]
+        batches = [
+            lines[i : i + post_processor_batch_size]
+            for i in range(0, len(lines), post_processor_batch_size)
+        ]
 
-            if "punctuation" in post_processors:
-                line = await self.post_processor_service.run_punctuation(
-                    line,
-                    source_language,
-                )
+        # Punctuation of a batch runs in the background while ITN of the
+        # next batch is in flight
+        punctuation_tasks: List[asyncio.Task] = []
+        processed_batches: List[List[str]] = []
+        try:
+            for batch in batches:
+                if "itn" in post_processors:
+                    batch = await self.post_processor_service.run_itn_batch(
+                        batch,
+                        source_language,
+                    )
+
+                if "punctuation" in post_processors:
+                    punctuation_tasks.append(
+                        asyncio.create_task(
+                            self.post_processor_service.run_punctuation_batch(
+                                batch,
+                                source_language,
+                            )
+                        )
+                    )
+                else:
+                    processed_batches.append(batch)
 
-            new_transcript_line = (line, transcript_line[1])
-            transcript_lines[idx] = new_transcript_line
+            if punctuation_tasks:
+                processed_batches = await asyncio.gather(*punctuation_tasks)
+        except BaseException:
+            for task in punctuation_tasks:
+                task.cancel()
+            raise
+
+        processed_lines = [line for batch in processed_batches for line in batch]
+        for idx, transcript_line in enumerate(transcript_lines):
+            transcript_lines[idx] = (processed_lines[idx], transcript_line[1])
 
         return transcript_lines
 
-    def __run_asr_pre_processors(self, audio: np.ndarray, pre_processors: List[str]):
+    async def __run_asr_pre_processors(
+        self,
+        audio: np.ndarray,
+        pre_processors: List[str],
+        vad_chunk_duration_s: float = 7,
+    ):
         audio_chunks, speech_timestamps = [audio], [
             {
                 "start": 0,
@@ -1059,8 +1551,11 @@ class InferenceService:
         ]
 
         if "vad" in pre_processors:
-            audio_chunks, speech_timestamps = self.audio_service.silero_vad_chunking(
-                audio, 16000, 7
+            (
+                audio_chunks,
+                speech_timestamps,
+            ) = await self.audio_service.silero_vad_chunking(
+                audio, 16000, vad_chunk_duration_s
             )
 
         if "denoiser" in pre_processors:
@@ -22,59 +22,63 @@ class PostProcessorService:
         line: str,
         language: str,
     ):
-        input1 = http_client.InferInput("INPUT_TEXT", [1, 1], "BYTES")
-        input1.set_data_from_numpy(
-            np.asarray([line.encode("utf-8")]).astype("object").reshape([1, 1])
-        )
-        input2 = http_client.InferInput("LANG_ID", [1, 1], "BYTES")
-        lang_id = [language]
-        input2.set_data_from_numpy(np.asarray(lang_id).astype("object").reshape([1, 1]))
-
-        inputs = [input1, input2]
-
-        output0 = http_client.InferRequestedOutput("OUTPUT_TEXT")
-        outputs = [output0]
-
-        headers = {"Authorization": "Bearer " + os.environ["ITN_ENDPOINT_API_KEY"]}
-
-        response = self.inference_gateway.send_triton_request(
-            url=os.environ["ITN_ENDPOINT"],
-            model_name="itn",
-            input_list=inputs,
-            output_list=outputs,
-            headers=headers,
-        )
-
-        batch_result = response.as_numpy("OUTPUT_TEXT")
-        if batch_result is None:
-            batch_result = np.array([])
-
-        res = " ".join([result.decode("utf8") for result in batch_result])
-        return res
+        res = await self.run_itn_batch([line], language)
+        return res[0]
 
     async def run_punctuation(
         self,
         line: str,
         language: str,
     ):
-        input1 = http_client.InferInput("INPUT_TEXT", [1, 1], "BYTES")
+        res = await self.run_punctuation_batch([line], language)
+        return res[0]
+
+    async def run_itn_batch(
+        self,
+        lines: List[str],
+        language: str,
+    ) -> List[str]:
+        return await self.__run_text_post_processor("itn", lines, language)
+
+    async def run_punctuation_batch(
+        self,
+        lines: List[str],
+        language: str,
+    ) -> List[str]:
+        return await self.__run_text_post_processor("punctuation", lines, language)
+
+    async def __run_text_post_processor(
+        self,
+        model_name: str,
+        lines: List[str],
+        language: str,
+    ) -> List[str]:
+        if not lines:
+            return []
+
+        batch_size = len(lines)
+        input1 = http_client.InferInput("INPUT_TEXT", [batch_size, 1], "BYTES")
         input1.set_data_from_numpy(
-            np.asarray([line.encode("utf-8")]).astype("object").reshape([1, 1])
+            np.asarray([line.encode("utf-8") for line in lines])
+            .astype("object")
+            .reshape([batch_size, 1])
+        )
+        input2 = http_client.InferInput("LANG_ID", [batch_size, 1], "BYTES")
+        lang_id = [language] * batch_size
+        input2.set_data_from_numpy(
+            np.asarray(lang_id).astype("object").reshape([batch_size, 1])
         )
-        input2 = http_client.InferInput("LANG_ID", [1, 1], "BYTES")
-        lang_id = [language]
-        input2.set_data_from_numpy(np.asarray(lang_id).astype("object").reshape([1, 1]))
 
         inputs = [input1, input2]
 
-        output0 = http_client.InferRequestedOutput("OUTPUT_TEXT")
+        output0 = http_client.InferRequestedOutput("OUTPUT_TEXT", binary_data=True)
         outputs = [output0]
 
         headers = {"Authorization": "Bearer " + os.environ["ITN_ENDPOINT_API_KEY"]}
 
-        response = self.inference_gateway.send_triton_request(
+        response = await self.inference_gateway.send_triton_request_async(
             url=os.environ["ITN_ENDPOINT"],
-            model_name="punctuation",
+            model_name=model_name,
             input_list=inputs,
             output_list=outputs,
             headers=headers,
@@ -84,5 +88,10 @@ class PostProcessorService:
         if batch_result is None:
             batch_result = np.array([])
 
-        res = " ".join([result.decode("utf8") for result in batch_result])
+        # One row of output segments per input line
+        batch_result = batch_result.reshape(batch_size, -1)
+
+        res = [
+            " ".join([result.decode("utf8") for result in row]) for row in batch_result
+        ]
         return res
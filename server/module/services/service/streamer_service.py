@@ -2,7 +2,7 @@ import json
 import os
 import subprocess
 import tempfile
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from urllib.request import urlopen
 
 import numpy as np
@@ -13,6 +13,8 @@ from pydub import AudioSegment
 from pydub.effects import normalize as pydub_normalize
 
 from ..gateway import InferenceGateway
+from ..utilities.energy_vad import energy_vad_timestamps
+from ..utilities.vad_backend import select_vad_backend
 from .triton_utils_service import TritonUtilsService
 
 
@@ -67,7 +69,47 @@ class AudioService:
         sample_rate: int,
         max_chunk_duration_s: float,
         min_speech_duration_ms: int = 100,
+        backend: Optional[str] = None,
     ) -> Tuple[List[np.ndarray], List[Dict[str, float]]]:
+        speech_timestamps = self.detect_speech(
+            audio, sample_rate, min_speech_duration_ms, backend
+        )
+
+        if not speech_timestamps:
+            return ([], [])
+
+        adjusted_timestamps = self.adjust_timestamps(
+            speech_timestamps, sample_rate, max_chunk_duration_s
+        )
+
+        audio_chunks: List[np.ndarray] = [
+            audio[timestamps["start"] : timestamps["end"]]
+            for timestamps in adjusted_timestamps
+        ]
+
+        return (audio_chunks, adjusted_timestamps)
+
+    def detect_speech(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        min_speech_duration_ms: int = 100,
+        backend: Optional[str] = None,
+    ) -> List[Dict[str, float]]:
+        """
+        Returns the speech segments of the audio as {"start", "end"} sample
+        offsets, found with the backend picked by select_vad_backend
+        """
+
+        if select_vad_backend(len(audio), sample_rate, backend) == "energy":
+            return energy_vad_timestamps(
+                audio,
+                sample_rate,
+                min_silence_duration_ms=400,
+                speech_pad_ms=200,
+                min_speech_duration_ms=min_speech_duration_ms,
+            )
+
         inputs, outputs = self.triton_utils_service.get_vad_io_for_triton(
             audio,
             sample_rate,
@@ -95,19 +137,7 @@ class AudioService:
         else:
             speech_timestamps = json.loads(batch_result[0].decode("utf-8"))
 
-        if not speech_timestamps:
-            return ([], [])
-
-        adjusted_timestamps = self.adjust_timestamps(
-            speech_timestamps, sample_rate, max_chunk_duration_s
-        )
-
-        audio_chunks: List[np.ndarray] = [
-            audio[timestamps["start"] : timestamps["end"]]
-            for timestamps in adjusted_timestamps
-        ]
-
-        return (audio_chunks, adjusted_timestamps)
+        return speech_timestamps or []
 
     def download_audio(self, url: str):
         if "youtube.com" in url or "youtu.be" in url or "drive.google.com" in url:
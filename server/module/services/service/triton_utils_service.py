@@ -2,6 +2,7 @@ from typing import List
 from PIL import Image
 import numpy as np
 import tritonclient.http as http_client
+from custom_metrics import ASR_BATCH_PADDING_RATIO
 from fastapi import Depends
 from tritonclient.utils import np_to_triton_dtype
 import requests
@@ -41,7 +42,7 @@ class TritonUtilsService:
             self.get_string_tensor([[src_lang]] * len(texts), "INPUT_LANGUAGE_ID"),
             self.get_string_tensor([[tgt_lang]] * len(texts), "OUTPUT_LANGUAGE_ID"),
         ]
-        outputs = [http_client.InferRequestedOutput("OUTPUT_TEXT")]
+        outputs = [http_client.InferRequestedOutput("OUTPUT_TEXT", binary_data=True)]
         return inputs, outputs
     
 
@@ -62,35 +63,36 @@ class TritonUtilsService:
         input_tensors[0].set_data_from_numpy(image)
         input_tensors[1].set_data_from_numpy(input_language_id)
         # Set outputs
-        outputs = [httpclient.InferRequestedOutput("OUTPUT_TEXT")]
+        outputs = [httpclient.InferRequestedOutput("OUTPUT_TEXT", binary_data=True)]
         
         return input_tensors , outputs
     def get_txtlangdetection_io_for_triton(
         self,
-        input_string: str
+        input_strings: List[str]
     ):
         inputs = [
-            self.get_string_tensor([input_string], "INPUT_TEXT",True)
+            self.get_string_tensor(input_strings, "INPUT_TEXT",True)
         ]
-        outputs = [http_client.InferRequestedOutput("OUTPUT_TEXT")]
+        outputs = [http_client.InferRequestedOutput("OUTPUT_TEXT", binary_data=True)]
         return inputs, outputs
 
     def get_transliteration_io_for_triton(
         self,
-        input_string: str,
+        input_strings: List[str],
         source_lang: str,
         target_lang: str,
         is_word_level: bool,
         top_k: int,
     ):
+        batch_size = len(input_strings)
         inputs = [
-            self.get_string_tensor([input_string], "INPUT_TEXT"),
-            self.get_string_tensor([source_lang], "INPUT_LANGUAGE_ID"),
-            self.get_string_tensor([target_lang], "OUTPUT_LANGUAGE_ID"),
-            self.get_bool_tensor([is_word_level], "IS_WORD_LEVEL"),
-            self.get_uint8_tensor([top_k], "TOP_K"),
+            self.get_string_tensor(input_strings, "INPUT_TEXT"),
+            self.get_string_tensor([source_lang] * batch_size, "INPUT_LANGUAGE_ID"),
+            self.get_string_tensor([target_lang] * batch_size, "OUTPUT_LANGUAGE_ID"),
+            self.get_bool_tensor([is_word_level] * batch_size, "IS_WORD_LEVEL"),
+            self.get_uint8_tensor([top_k] * batch_size, "TOP_K"),
         ]
-        outputs = [http_client.InferRequestedOutput("OUTPUT_TEXT")]
+        outputs = [http_client.InferRequestedOutput("OUTPUT_TEXT", binary_data=True)]
         return inputs, outputs
 
     def get_tts_io_for_triton(
@@ -101,7 +103,9 @@ class TritonUtilsService:
             self.get_string_tensor([ip_gender], "INPUT_SPEAKER_ID"),
             self.get_string_tensor([ip_language], "INPUT_LANGUAGE_ID"),
         ]
-        outputs = [http_client.InferRequestedOutput("OUTPUT_GENERATED_AUDIO")]
+        outputs = [
+            http_client.InferRequestedOutput("OUTPUT_GENERATED_AUDIO", binary_data=True)
+        ]
         return inputs, outputs
 
     def get_asr_io_for_triton(
@@ -112,6 +116,9 @@ class TritonUtilsService:
         n_best_tok: int = 0,
     ):
         o = self.__pad_batch(audio_chunks)
+        ASR_BATCH_PADDING_RATIO.labels(service_id).observe(
+            1 - o[1].sum() / o[0].size if o[0].size else 0
+        )
         input0 = http_client.InferInput("AUDIO_SIGNAL", o[0].shape, "FP32")
         input1 = http_client.InferInput("NUM_SAMPLES", o[1].shape, "INT32")
         input0.set_data_from_numpy(o[0])
@@ -140,7 +147,7 @@ class TritonUtilsService:
             )
             inputs.append(input3)
 
-        outputs = [http_client.InferRequestedOutput("TRANSCRIPTS")]
+        outputs = [http_client.InferRequestedOutput("TRANSCRIPTS", binary_data=True)]
         return inputs, outputs
 
     def get_vad_io_for_triton(
@@ -176,7 +183,7 @@ class TritonUtilsService:
         )
 
         inputs = [input0, input1, input2, input3, input4, input5]
-        outputs = [http_client.InferRequestedOutput("TIMESTAMPS")]
+        outputs = [http_client.InferRequestedOutput("TIMESTAMPS", binary_data=True)]
 
         return inputs, outputs
 
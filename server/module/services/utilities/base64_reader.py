@@ -0,0 +1,58 @@
+import base64
+import io
+import re
+
+# Random access needs every 4 characters to decode to exactly 3 bytes, so
+# content with line breaks or other non-alphabet characters is not eligible
+_STRICT_BASE64 = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+
+class Base64Reader(io.RawIOBase):
+    """
+    Seekable binary file over a base64 string that decodes only the range
+    being read, so the decoded content never has to be held in memory at
+    once. Use `is_supported` to check the string first.
+    """
+
+    def __init__(self, content: str) -> None:
+        super().__init__()
+        self.__content = content
+        self.__length = len(content) // 4 * 3 - content[-2:].count("=")
+        self.__position = 0
+
+    @staticmethod
+    def is_supported(content: str) -> bool:
+        return len(content) % 4 == 0 and bool(_STRICT_BASE64.fullmatch(content))
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.__position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence == io.SEEK_END:
+            offset += self.__length
+
+        self.__position = max(offset, 0)
+        return self.__position
+
+    def readinto(self, buffer) -> int:
+        start = self.__position
+        end = min(start + len(buffer), self.__length)
+        if end <= start:
+            return 0
+
+        # Decode the whole 4-character groups covering [start, end)
+        first_group, last_group = start // 3, -(-end // 3)
+        decoded = base64.b64decode(self.__content[first_group * 4 : last_group * 4])
+        data = decoded[start - first_group * 3 : end - first_group * 3]
+
+        buffer[: len(data)] = data
+        self.__position = end
+        return len(data)
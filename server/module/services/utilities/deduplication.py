@@ -0,0 +1,35 @@
+from typing import Dict, Hashable, List, Sequence, Tuple, TypeVar
+
+from custom_metrics import INFERENCE_DEDUP_RATIO
+
+T = TypeVar("T", bound=Hashable)
+U = TypeVar("U")
+
+
+def deduplicate(items: Sequence[T], task_type: str) -> Tuple[List[T], List[int]]:
+    """
+    Returns the unique items in order of first occurrence, and for every
+    original item the position of its copy among the unique ones
+    """
+
+    unique_items: List[T] = []
+    unique_positions: Dict[T, int] = {}
+    positions: List[int] = []
+    for item in items:
+        if item not in unique_positions:
+            unique_positions[item] = len(unique_items)
+            unique_items.append(item)
+        positions.append(unique_positions[item])
+
+    if items:
+        INFERENCE_DEDUP_RATIO.labels(task_type).observe(
+            1 - len(unique_items) / len(items)
+        )
+
+    return unique_items, positions
+
+
+def fan_out(unique_outputs: Sequence[U], positions: List[int]) -> List[U]:
+    """Maps the outputs of the unique items back to every original position"""
+
+    return [unique_outputs[position] for position in positions]
@@ -0,0 +1,81 @@
+from typing import Dict, List
+
+import numpy as np
+
+FRAME_DURATION_MS = 30
+# Frames this far above the noise floor count as voiced speech, and frames at
+# least half as far above it count as unvoiced speech if they cross zero often
+ENERGY_MARGIN_DB = 12.0
+UNVOICED_ZERO_CROSSING_RATE = 0.25
+# Frames quieter than this are never speech, whatever the noise floor
+MIN_SPEECH_ENERGY_DB = -55.0
+NOISE_FLOOR_PERCENTILE = 10
+
+
+def energy_vad_timestamps(
+    audio: np.ndarray,
+    sample_rate: int,
+    min_silence_duration_ms: int = 400,
+    speech_pad_ms: int = 200,
+    min_speech_duration_ms: int = 100,
+) -> List[Dict[str, int]]:
+    """
+    CPU speech detector based on short-term energy and zero-crossing rate,
+    returning speech segments as {"start", "end"} sample offsets like the
+    Silero VAD model does, with the same meaning for the duration arguments
+    """
+
+    frame_size = max(sample_rate * FRAME_DURATION_MS // 1000, 1)
+    frame_count = len(audio) // frame_size
+    if not frame_count:
+        return []
+
+    frames = audio[: frame_count * frame_size].reshape(frame_count, frame_size)
+
+    energy_db = 10 * np.log10(
+        np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame_size + 1e-12
+    )
+    signs = np.signbit(frames)
+    zero_crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+    zero_crossing_rate = zero_crossings / max(frame_size - 1, 1)
+
+    # Steady noise stays within the margin of its own floor and is never
+    # speech, while speech without pauses still varies well beyond it
+    noise_floor_db = np.percentile(energy_db, NOISE_FLOOR_PERCENTILE)
+    voiced = energy_db >= max(noise_floor_db + ENERGY_MARGIN_DB, MIN_SPEECH_ENERGY_DB)
+    unvoiced = (
+        energy_db >= max(noise_floor_db + ENERGY_MARGIN_DB / 2, MIN_SPEECH_ENERGY_DB)
+    ) & (zero_crossing_rate >= UNVOICED_ZERO_CROSSING_RATE)
+    is_speech = voiced | unvoiced
+
+    # Frame indices where runs of speech start and end
+    edges = np.diff(is_speech.astype(np.int8), prepend=0, append=0)
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+
+    min_silence_frames = min_silence_duration_ms / FRAME_DURATION_MS
+    segments: List[List[int]] = []
+    for run_start, run_end in zip(run_starts, run_ends):
+        if segments and run_start - segments[-1][1] < min_silence_frames:
+            segments[-1][1] = run_end
+        else:
+            segments.append([run_start, run_end])
+
+    min_speech_frames = min_speech_duration_ms / FRAME_DURATION_MS
+    speech_pad = sample_rate * speech_pad_ms // 1000
+
+    speech_timestamps: List[Dict[str, int]] = []
+    for start_frame, end_frame in segments:
+        if end_frame - start_frame < min_speech_frames:
+            continue
+
+        start = max(int(start_frame) * frame_size - speech_pad, 0)
+        end = min(int(end_frame) * frame_size + speech_pad, len(audio))
+
+        # Padding can make neighbouring segments overlap
+        if speech_timestamps and start <= speech_timestamps[-1]["end"]:
+            speech_timestamps[-1]["end"] = end
+        else:
+            speech_timestamps.append({"start": start, "end": end})
+
+    return speech_timestamps
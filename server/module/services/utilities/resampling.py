@@ -0,0 +1,122 @@
+from functools import lru_cache
+from math import gcd
+from typing import Iterable, Iterator, Tuple
+
+import numpy as np
+import scipy.signal as sps
+
+# Same anti-aliasing filter scipy.signal.resample_poly designs by default
+FILTER_HALF_LENGTH_FACTOR = 10
+FILTER_WINDOW = ("kaiser", 5.0)
+
+
+def resample_ratio(sampling_rate: int, target_rate: int) -> Tuple[int, int]:
+    divisor = gcd(int(sampling_rate), int(target_rate))
+    return int(target_rate) // divisor, int(sampling_rate) // divisor
+
+
+@lru_cache(maxsize=32)
+def polyphase_filter(up: int, down: int, dtype: str = "float32") -> np.ndarray:
+    max_rate = max(up, down)
+    half_length = FILTER_HALF_LENGTH_FACTOR * max_rate
+    coefficients = sps.firwin(
+        2 * half_length + 1, 1.0 / max_rate, window=FILTER_WINDOW
+    )
+    coefficients = coefficients.astype(dtype)
+
+    # Shared between callers through the cache
+    coefficients.flags.writeable = False
+    return coefficients
+
+
+class PolyphaseResampler:
+    """
+    Resamples a signal fed to it in blocks of any size, producing the same
+    samples as a single scipy.signal.resample_poly call over the whole signal.
+
+    Each call to `process` returns the output samples whose filter support is
+    fully covered by the input seen so far; `flush` returns the rest once the
+    input is exhausted. Only about one filter length of input is retained
+    between calls.
+    """
+
+    def __init__(self, sampling_rate: int, target_rate: int, dtype: str = "float32"):
+        self.up, self.down = resample_ratio(sampling_rate, target_rate)
+        self.dtype = dtype
+        self.passthrough = self.up == self.down
+        self.filter = (
+            None if self.passthrough else polyphase_filter(self.up, self.down, dtype)
+        )
+
+        # Input samples either side of a block that influence its outputs,
+        # rounded to a whole number of `down` steps so block boundaries map
+        # onto whole output samples
+        half_length = 0 if self.filter is None else len(self.filter) // 2
+        context = -(-half_length // self.up)
+        self.__context = -(-context // self.down) * self.down
+
+        self.__buffer = np.zeros(0, dtype=dtype)
+        # Absolute input index of the first sample in __buffer
+        self.__buffer_start = 0
+        # Absolute input index up to which output has been emitted
+        self.__emitted_until = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if self.passthrough:
+            return block.astype(self.dtype, copy=False)
+
+        self.__buffer = np.concatenate((self.__buffer, block.astype(self.dtype)))
+        available_until = self.__buffer_start + len(self.__buffer)
+
+        end = available_until - self.__context
+        end -= end % self.down
+        if end <= self.__emitted_until:
+            return np.zeros(0, dtype=self.dtype)
+
+        return self.__resample_until(end, available_until)
+
+    def flush(self) -> np.ndarray:
+        available_until = self.__buffer_start + len(self.__buffer)
+        if available_until <= self.__emitted_until:
+            return np.zeros(0, dtype=self.dtype)
+
+        return self.__resample_until(available_until, available_until)
+
+    def __resample_until(self, end: int, available_until: int) -> np.ndarray:
+        start = self.__emitted_until
+        segment_start = max(start - self.__context, 0)
+        segment_end = min(end + self.__context, available_until)
+
+        segment = self.__buffer[
+            segment_start - self.__buffer_start : segment_end - self.__buffer_start
+        ]
+        resampled = sps.resample_poly(segment, self.up, self.down, window=self.filter)
+
+        offset = (start - segment_start) * self.up // self.down
+        count = -(-end * self.up // self.down) - start * self.up // self.down
+        output = resampled[offset : offset + count]
+
+        # Keep just enough history to serve as left context for the next block
+        keep_from = max(end - self.__context, 0)
+        self.__buffer = self.__buffer[keep_from - self.__buffer_start :]
+        self.__buffer_start = keep_from
+        self.__emitted_until = end
+
+        return output
+
+
+def resample_blocks(
+    blocks: Iterable[np.ndarray],
+    sampling_rate: int,
+    target_rate: int,
+    dtype: str = "float32",
+) -> Iterator[np.ndarray]:
+    resampler = PolyphaseResampler(sampling_rate, target_rate, dtype)
+    for block in blocks:
+        output = resampler.process(block)
+        if len(output):
+            yield output
+
+    output = resampler.flush()
+    if len(output):
+        yield output
@@ -0,0 +1,31 @@
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "triton", "energy" or "auto", see select_vad_backend
+VAD_BACKEND = os.environ.get("VAD_BACKEND", "triton")
+VAD_AUTO_MAX_DURATION_S = float(os.environ.get("VAD_AUTO_MAX_DURATION_S", 30))
+
+
+def select_vad_backend(
+    sample_count: int, sample_rate: int, backend: Optional[str] = None
+) -> str:
+    """
+    Returns where to detect speech in audio of `sample_count` samples: with
+    the remote Silero model ("triton") or in process ("energy"). "auto" picks
+    the in-process detector for audio up to VAD_AUTO_MAX_DURATION_S long and
+    the remote model for anything longer. Defaults to VAD_BACKEND.
+    """
+
+    backend = backend or VAD_BACKEND
+    if backend == "auto":
+        max_samples = VAD_AUTO_MAX_DURATION_S * sample_rate
+        backend = "energy" if sample_count <= max_samples else "triton"
+
+    if backend not in ("triton", "energy"):
+        raise ValueError(f"Unknown VAD backend: {backend}")
+
+    return backend
@@ -3,6 +3,7 @@ from .image_format import ImageFormat
 from .dhruva_model import Model
 from .dhruva_service import Service
 from .gender import Gender
+from .triton_transport import TritonTransport
 from .lang_to_script import LANG_CODE_TO_SCRIPT_CODE
 from .ulca_audio import _ULCAAudio
 from .ulca_image import _ULCAImage
@@ -1,6 +1,8 @@
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, conint
+
+from .triton_transport import TritonTransport
 
 
 class _Benchmark(BaseModel):
@@ -22,4 +24,14 @@ class Service(BaseModel):
     modelId: str
     endpoint: str
     api_key: str
+    transport: TritonTransport = TritonTransport.HTTP
+    maxBatchSize: conint(gt=0) = 32  # type: ignore
+    maxInflightRequests: Optional[conint(gt=0)] = None  # type: ignore
+    requestTimeoutS: float = 20
+    vadChunkDurationS: float = 7
     benchmarks: Optional[Dict[str, List[_Benchmark]]]
+
+    class Config:
+        # Stored in Mongo and the cache as a plain string, ServiceCache drops
+        # values of any type other than the primitive ones
+        use_enum_values = True
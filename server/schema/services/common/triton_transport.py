@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class TritonTransport(str, Enum):
+    HTTP = "http"
+    GRPC = "grpc"
@@ -1,8 +1,8 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, conint
 
-from ..common import _ULCALanguagePair
+from ..common import TritonTransport, _ULCALanguagePair
 
 
 class ServiceUpdateRequest(BaseModel):
@@ -12,3 +12,13 @@ class ServiceUpdateRequest(BaseModel):
     languagePair: Optional[_ULCALanguagePair]
     hardwareDescription: Optional[str]
     endpoint: Optional[str]
+    transport: Optional[TritonTransport]
+    maxBatchSize: Optional[conint(gt=0)]  # type: ignore
+    maxInflightRequests: Optional[conint(gt=0)]  # type: ignore
+    requestTimeoutS: Optional[float]
+    vadChunkDurationS: Optional[float]
+
+    class Config:
+        # Stored in Mongo and the cache as a plain string, ServiceCache drops
+        # values of any type other than the primitive ones
+        use_enum_values = True
@@ -0,0 +1,47 @@
+import os
+
+import fakeredis
+import pytest
+from sqlalchemy import MetaData
+
+# The tests run without any of the backing services. Settings that are read at
+# import time get placeholder values, and the metering tables that are created
+# at import time are skipped.
+for name, value in {
+    "APP_DB_NAME": "dhruva",
+    "APP_DB_CONNECTION_STRING": "mongodb://localhost:27017",
+    "LOG_DB_CONNECTION_STRING": "mongodb://localhost:27017",
+    "JWT_SECRET_KEY": "secret",
+    "TIMESCALE_USER": "dhruva",
+    "TIMESCALE_PASSWORD": "dhruva",
+    "TIMESCALE_HOST": "localhost",
+    "TIMESCALE_PORT": "5432",
+    "TIMESCALE_DATABASE_NAME": "dhruva",
+}.items():
+    os.environ.setdefault(name, value)
+
+MetaData.create_all = lambda *args, **kwargs: None  # type: ignore
+
+# Importing module first resolves its circular imports with auth
+import module  # noqa: E402
+
+from cache import app_cache  # noqa: E402
+from module.auth.model.api_key import ApiKeyCache  # noqa: E402
+from module.services.model import ModelCache, ServiceCache  # noqa: E402
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """In-memory Redis shared by the cache models and all other cache helpers"""
+
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(app_cache, "get_redis_connection", lambda **kwargs: redis)
+    for cache_model in (ApiKeyCache, ModelCache, ServiceCache):
+        monkeypatch.setattr(cache_model._meta, "database", redis)
+
+    # The connections are created once per process, drop the real ones
+    app_cache.get_cache_connection.cache_clear()
+    app_cache.get_result_cache_connection.cache_clear()
+    yield redis
+    app_cache.get_cache_connection.cache_clear()
+    app_cache.get_result_cache_connection.cache_clear()
@@ -0,0 +1,116 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from module.services.model import ServiceCache
+from module.services.service.admin_service import AdminService
+from schema.services.request import ServiceCreateRequest, ServiceUpdateRequest
+
+
+def create_service(admin_service: AdminService, **fields):
+    request = {
+        "serviceId": "ai4bharat/indictrans-v2-all-gpu--t4",
+        "name": "IndicTrans",
+        "serviceDescription": "Translation",
+        "hardwareDescription": "T4",
+        "publishedOn": 1,
+        "modelId": "indictrans-v2",
+        "endpoint": "triton.example.com",
+        "api_key": "secret",
+    }
+    request.update(fields)
+    admin_service.create_service(ServiceCreateRequest(**request))
+    return request["serviceId"]
+
+
+def make_admin_service():
+    service_repository = MagicMock()
+    service_repository.insert_one.return_value = "6430f2b0c1a9e4b5d6f7a8b9"
+    return AdminService(service_repository, MagicMock(), MagicMock()), service_repository
+
+
+def test_create_service_caches_grpc_transport(fake_redis):
+    admin_service, _ = make_admin_service()
+
+    service_id = create_service(admin_service, transport="grpc")
+
+    assert ServiceCache.get(service_id).transport == "grpc"
+
+
+def test_update_service_caches_grpc_transport(fake_redis):
+    admin_service, service_repository = make_admin_service()
+    service_id = create_service(admin_service)
+
+    admin_service.update_service(
+        ServiceUpdateRequest(serviceId=service_id, transport="grpc")
+    )
+
+    assert ServiceCache.get(service_id).transport == "grpc"
+    service_repository.update_one.assert_called_once_with(
+        {"serviceId": service_id, "transport": "grpc"}
+    )
+
+
+def test_partial_update_keeps_transport(fake_redis):
+    admin_service, service_repository = make_admin_service()
+    service_id = create_service(admin_service, transport="grpc")
+
+    admin_service.update_service(
+        ServiceUpdateRequest(serviceId=service_id, endpoint="triton2.example.com")
+    )
+
+    assert ServiceCache.get(service_id).transport == "grpc"
+    (update,), _ = service_repository.update_one.call_args
+    assert "transport" not in update
+
+
+def test_create_service_leaves_inflight_requests_unbounded(fake_redis):
+    admin_service, _ = make_admin_service()
+
+    service_id = create_service(admin_service)
+
+    assert ServiceCache.get(service_id).maxInflightRequests is None
+
+
+def test_update_service_caches_inflight_limit(fake_redis):
+    admin_service, _ = make_admin_service()
+    service_id = create_service(admin_service)
+
+    admin_service.update_service(
+        ServiceUpdateRequest(serviceId=service_id, maxInflightRequests=8)
+    )
+
+    assert ServiceCache.get(service_id).maxInflightRequests == 8
+
+
+def test_create_whisper_service_sends_one_chunk_at_a_time(fake_redis):
+    admin_service, service_repository = make_admin_service()
+
+    service_id = create_service(
+        admin_service, serviceId="ai4bharat/whisper-medium-en--gpu--t4"
+    )
+
+    assert ServiceCache.get(service_id).maxBatchSize == 1
+    assert service_repository.insert_one.call_args.args[0].maxBatchSize == 1
+
+
+def test_create_whisper_service_keeps_explicit_batch_size(fake_redis):
+    admin_service, _ = make_admin_service()
+
+    service_id = create_service(
+        admin_service, serviceId="ai4bharat/whisper-medium-en--gpu--t4", maxBatchSize=4
+    )
+
+    assert ServiceCache.get(service_id).maxBatchSize == 4
+
+
+@pytest.mark.parametrize("field", ["maxBatchSize", "maxInflightRequests"])
+@pytest.mark.parametrize("value", [0, -1])
+def test_profile_sizes_must_be_positive(field, value):
+    admin_service, _ = make_admin_service()
+
+    with pytest.raises(ValidationError):
+        create_service(admin_service, **{field: value})
+    with pytest.raises(ValidationError):
+        ServiceUpdateRequest(serviceId="ai4bharat/indictrans", **{field: value})
@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import io
+from contextlib import nullcontext
+from unittest.mock import MagicMock
+
+import numpy as np
+import soundfile as sf
+
+from module.services.model import Service
+from module.services.service import inference_service
+from module.services.service.audio_service import AudioService
+from module.services.service.inference_service import InferenceService
+from module.services.service.subtitle_service import SubtitleService
+from module.services.service.triton_utils_service import TritonUtilsService
+from schema.services.request import ULCAAsrInferenceRequest
+
+SAMPLE_RATE = 16000
+
+
+class ShortWindowAudioService(AudioService):
+    """Streams audio in one second windows so short clips span several"""
+
+    def stream_audio(self, file_handle, target_rate, window_s=1.0, **kwargs):
+        return super().stream_audio(file_handle, target_rate, window_s, **kwargs)
+
+
+class FakeResponse:
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+
+    def as_numpy(self, name):
+        return np.array([b"line"] * self.batch_size, dtype=object)
+
+
+class FakeGateway:
+    def __init__(self):
+        self.batches = []
+        self.running = self.peak = 0
+
+    def inflight_limit(self, service):
+        return nullcontext()
+
+    async def send_triton_request_async(self, input_list, **kwargs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+
+        self.batches.append(input_list[0].shape())
+        return FakeResponse(input_list[0].shape()[0])
+
+
+def make_request(service_id: str, seconds: int, pre_processors):
+    t = np.arange(SAMPLE_RATE * seconds) / SAMPLE_RATE
+    buffer = io.BytesIO()
+    sf.write(buffer, 0.5 * np.sin(2 * np.pi * 220 * t), SAMPLE_RATE, format="WAV")
+
+    return ULCAAsrInferenceRequest(
+        **{
+            "config": {
+                "serviceId": service_id,
+                "language": {"sourceLanguage": "hi"},
+                "preProcessors": pre_processors,
+                "profanityFilter": False,
+            },
+            "audio": [{"audioContent": base64.b64encode(buffer.getvalue()).decode()}],
+        }
+    )
+
+
+def run_asr(monkeypatch, seconds: int, pre_processors, max_batch_size: int = 4):
+    service = Service(
+        serviceId="ai4bharat/conformer-hi-gpu--t4",
+        name="Conformer",
+        serviceDescription="ASR",
+        hardwareDescription="T4",
+        publishedOn=1,
+        modelId="conformer-hi",
+        endpoint="triton.example.com",
+        api_key="secret",
+        maxBatchSize=max_batch_size,
+    )
+    monkeypatch.setattr(
+        inference_service.service_local_cache, "get", lambda key: service
+    )
+
+    gateway = FakeGateway()
+    audio_service = ShortWindowAudioService()
+
+    # One chunk per second of audio stands in for the VAD model
+    async def vad_chunking(audio, sample_rate, max_chunk_duration_s):
+        starts = range(0, len(audio), sample_rate)
+        return [audio[start : start + sample_rate] for start in starts], [
+            {
+                "start": start,
+                "start_secs": start / sample_rate,
+                "end": start + sample_rate,
+                "end_secs": start / sample_rate + 1,
+            }
+            for start in starts
+        ]
+
+    monkeypatch.setattr(audio_service, "silero_vad_chunking", vad_chunking)
+
+    asr = InferenceService(
+        MagicMock(),
+        MagicMock(),
+        gateway,
+        SubtitleService(),
+        MagicMock(),
+        audio_service,
+        MagicMock(),
+        TritonUtilsService(),
+    )
+    request = make_request(service.serviceId, seconds, pre_processors)
+    asyncio.run(asr.run_asr_triton_inference(request, "key", "user"))
+    return gateway
+
+
+def test_audio_without_vad_is_transcribed_as_one_chunk(monkeypatch):
+    gateway = run_asr(monkeypatch, seconds=3, pre_processors=[])
+
+    assert gateway.batches == [(1, 3 * SAMPLE_RATE)]
+
+
+def test_vad_chunks_are_batched_with_bounded_pending_batches(monkeypatch):
+    monkeypatch.setattr(inference_service, "asr_max_pending_batches", 2)
+
+    gateway = run_asr(monkeypatch, seconds=12, pre_processors=["vad"])
+
+    assert [batch[0] for batch in gateway.batches] == [4, 4, 4]
+    assert gateway.peak <= 2
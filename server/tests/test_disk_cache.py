@@ -0,0 +1,35 @@
+from cache.disk_cache import DiskCache
+
+
+def test_overwriting_a_value_does_not_count_it_twice(tmp_path):
+    disk_cache = DiskCache(str(tmp_path), max_bytes=100)
+
+    disk_cache.set("aa01", "x" * 60)
+    disk_cache.set("aa01", "y" * 60)
+    disk_cache.set("bb01", "z" * 30)
+
+    assert disk_cache.get("aa01") == "y" * 60
+    assert disk_cache.get("bb01") == "z" * 30
+
+
+def test_least_recently_used_values_are_evicted(tmp_path):
+    disk_cache = DiskCache(str(tmp_path), max_bytes=100)
+    disk_cache.set("aa01", "a" * 40)
+    disk_cache.set("bb01", "b" * 40)
+    disk_cache.get("aa01")
+
+    disk_cache.set("cc01", "c" * 40)
+
+    assert disk_cache.get("aa01") == "a" * 40
+    assert disk_cache.get("bb01") is None
+    assert disk_cache.get("cc01") == "c" * 40
+
+
+def test_index_is_rebuilt_from_disk_on_startup(tmp_path):
+    DiskCache(str(tmp_path), max_bytes=100).set("aa01", "a" * 60)
+
+    disk_cache = DiskCache(str(tmp_path), max_bytes=100)
+    disk_cache.set("bb01", "b" * 60)
+
+    assert disk_cache.get("aa01") is None
+    assert disk_cache.get("bb01") == "b" * 60
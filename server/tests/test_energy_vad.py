@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from module.services.utilities.energy_vad import energy_vad_timestamps
+from module.services.utilities.vad_backend import select_vad_backend
+
+SAMPLE_RATE = 16000
+
+
+def white_noise(seconds: float, level_db: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal(int(seconds * SAMPLE_RATE))
+    return (10 ** (level_db / 20) * noise).astype(np.float32)
+
+
+def test_stationary_noise_is_not_speech():
+    audio = white_noise(5, level_db=-25)
+
+    assert energy_vad_timestamps(audio, SAMPLE_RATE) == []
+
+
+def test_speech_is_found_in_stationary_noise():
+    audio = white_noise(5, level_db=-40)
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    audio[2 * SAMPLE_RATE : 3 * SAMPLE_RATE] += 0.3 * np.sin(2 * np.pi * 220 * t)
+
+    timestamps = energy_vad_timestamps(audio, SAMPLE_RATE)
+
+    assert len(timestamps) == 1
+    assert timestamps[0]["start"] <= 2 * SAMPLE_RATE
+    assert timestamps[0]["end"] >= 3 * SAMPLE_RATE
+
+
+def test_speech_without_pauses_is_found():
+    t = np.arange(5 * SAMPLE_RATE) / SAMPLE_RATE
+    # Syllable-rate loudness changes, never falling silent
+    envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t)
+    audio = (0.3 * envelope * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    timestamps = energy_vad_timestamps(audio, SAMPLE_RATE)
+
+    assert timestamps == [{"start": 0, "end": len(audio)}]
+
+
+@pytest.mark.parametrize(
+    "seconds, backend", [(10, "energy"), (30, "energy"), (31, "triton")]
+)
+def test_auto_backend_picks_by_duration(seconds, backend):
+    assert select_vad_backend(seconds * SAMPLE_RATE, SAMPLE_RATE, "auto") == backend
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        select_vad_backend(SAMPLE_RATE, SAMPLE_RATE, "webrtc")
@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import pytest
+
+from exception.base_error import BaseError
+from module.services.gateway.inference_gateway import InferenceGateway, inflight_limits
+from module.services.gateway.triton_client_pool import async_triton_client_pool
+from module.services.model import Service
+
+
+def make_service(**fields):
+    service = {
+        "serviceId": "ai4bharat/indictrans-v2-all-gpu--t4",
+        "name": "IndicTrans",
+        "serviceDescription": "Translation",
+        "hardwareDescription": "T4",
+        "publishedOn": 1,
+        "modelId": "indictrans-v2",
+        "endpoint": "triton.example.com",
+        "api_key": "secret",
+    }
+    service.update(fields)
+    return Service(**service)
+
+
+async def peak_concurrency(gateway: InferenceGateway, services, requests: int):
+    running = peak = 0
+
+    async def request(service):
+        nonlocal running, peak
+        async with gateway.inflight_limit(service):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(
+        *(request(services[i % len(services)]) for i in range(requests))
+    )
+    return peak
+
+
+def test_inflight_requests_are_unbounded_by_default():
+    gateway = InferenceGateway()
+
+    peak = asyncio.run(peak_concurrency(gateway, [make_service()], 16))
+
+    assert peak == 16
+
+
+def test_inflight_limit_is_per_service():
+    gateway = InferenceGateway()
+    # Both services share an endpoint, each gets its own slots
+    services = [
+        make_service(serviceId="ai4bharat/first", maxInflightRequests=2),
+        make_service(serviceId="ai4bharat/second", maxInflightRequests=2),
+    ]
+
+    peak = asyncio.run(peak_concurrency(gateway, services, 16))
+
+    assert peak == 4
+
+
+def test_changed_inflight_limit_replaces_the_old_slots():
+    gateway = InferenceGateway()
+    service_id = "ai4bharat/changed-limit"
+    gateway.inflight_limit(make_service(serviceId=service_id, maxInflightRequests=2))
+
+    services = [make_service(serviceId=service_id, maxInflightRequests=3)]
+    peak = asyncio.run(peak_concurrency(gateway, services, 16))
+
+    assert peak == 3
+    assert inflight_limits[service_id][0] == 3
+
+
+class FakeResponse:
+    """aiohttp response whose body the client has already decompressed"""
+
+    headers = {"Content-Encoding": "gzip"}
+
+    def __init__(self, body: bytes, status: int):
+        self.body = body
+        self.status = status
+
+    async def read(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakeSession:
+    def __init__(self, body: bytes, status: int = 200):
+        self.body = body
+        self.status = status
+
+    def post(self, url, **kwargs):
+        return FakeResponse(self.body, self.status)
+
+
+def send_triton_request(monkeypatch, session: FakeSession):
+    monkeypatch.setattr(async_triton_client_pool, "get_client", lambda *args: session)
+
+    return asyncio.run(
+        InferenceGateway().send_triton_request_async(
+            url="triton.example.com",
+            headers={},
+            model_name="nmt",
+            input_list=[],
+            output_list=[],
+        )
+    )
+
+
+def test_compressed_triton_response_is_decoded_once(monkeypatch):
+    body = json.dumps(
+        {
+            "model_name": "nmt",
+            "outputs": [
+                {
+                    "name": "OUTPUT_TEXT",
+                    "datatype": "BYTES",
+                    "shape": [1],
+                    "data": ["नमस्ते"],
+                }
+            ],
+        }
+    ).encode("utf-8")
+    response = send_triton_request(monkeypatch, FakeSession(body))
+
+    assert response.as_numpy("OUTPUT_TEXT").tolist() == ["नमस्ते"]
+
+
+@pytest.mark.parametrize("status, rejected", [(400, True), (503, False)])
+def test_only_rejected_inputs_are_reported_as_such(monkeypatch, status, rejected):
+    with pytest.raises(BaseError) as exc_info:
+        send_triton_request(monkeypatch, FakeSession(b"error", status))
+
+    assert InferenceGateway.is_rejected_request(exc_info.value) == rejected
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from module.services.gateway import MicroBatcher
+
+
+async def translate(items):
+    if "bad" in items:
+        raise ValueError("model rejected the batch")
+    return [item.upper() for item in items]
+
+
+def test_merged_requests_get_their_own_outputs():
+    async def run():
+        batcher = MicroBatcher(max_wait_ms=10)
+        return await asyncio.gather(
+            batcher.submit("en-hi", ["a", "b"], translate, max_batch_size=8),
+            batcher.submit("en-hi", ["c"], translate, max_batch_size=8),
+        )
+
+    assert asyncio.run(run()) == [["A", "B"], ["C"]]
+
+
+def is_input_error(exc):
+    return isinstance(exc, ValueError)
+
+
+def test_failing_input_only_fails_its_own_request():
+    async def run():
+        batcher = MicroBatcher(max_wait_ms=10, is_input_error=is_input_error)
+        return await asyncio.gather(
+            batcher.submit("en-hi", ["a"], translate, max_batch_size=8),
+            batcher.submit("en-hi", ["bad"], translate, max_batch_size=8),
+            batcher.submit("en-hi", ["c"], translate, max_batch_size=8),
+            return_exceptions=True,
+        )
+
+    good, bad, other = asyncio.run(run())
+    assert good == ["A"]
+    assert isinstance(bad, ValueError)
+    assert other == ["C"]
+
+
+def test_unavailable_model_fails_all_requests_without_retrying():
+    calls = []
+
+    async def unavailable(items):
+        calls.append(items)
+        raise ConnectionError("model is down")
+
+    async def run():
+        batcher = MicroBatcher(max_wait_ms=10, is_input_error=is_input_error)
+        return await asyncio.gather(
+            *(
+                batcher.submit("en-hi", [item], unavailable, max_batch_size=8)
+                for item in ("a", "b", "c")
+            ),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert calls == [["a", "b", "c"]]
+
+
+def test_single_request_batch_failure_is_raised():
+    async def run():
+        batcher = MicroBatcher(max_wait_ms=10)
+        await batcher.submit("en-hi", ["bad"], translate, max_batch_size=8)
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
@@ -0,0 +1,29 @@
+from cache.result_cache import ResultCache
+
+
+def make_result_cache():
+    return ResultCache(
+        "translation",
+        local_max_size=10,
+        local_ttl_s=60,
+        redis_ttl_s=60,
+        max_value_bytes=100,
+    )
+
+
+def test_results_are_shared_through_their_own_redis(fake_redis, monkeypatch):
+    monkeypatch.setenv("RESULT_CACHE_REDIS_HOST", "localhost")
+
+    make_result_cache().set_many({"a01": "नमस्ते"})
+
+    assert make_result_cache().get_many(["a01"]) == {"a01": "नमस्ते"}
+
+
+def test_results_stay_out_of_the_main_redis(fake_redis, monkeypatch):
+    monkeypatch.delenv("RESULT_CACHE_REDIS_HOST", raising=False)
+    result_cache = make_result_cache()
+
+    result_cache.set_many({"a01": "नमस्ते"})
+
+    assert fake_redis.keys() == []
+    assert result_cache.get_many(["a01"]) == {"a01": "नमस्ते"}
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+from cache.single_flight import AsyncSingleFlight
+
+
+def test_concurrent_loads_of_a_key_share_one_call():
+    single_flight = AsyncSingleFlight(redis_lock=False, lock_ttl_s=5)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(
+            *(single_flight.do("service:a", loader) for _ in range(8))
+        )
+
+    assert asyncio.run(main()) == ["value"] * 8
+    assert len(calls) == 1
+
+
+
+def test_cancelled_first_caller_does_not_fail_the_others():
+    single_flight = AsyncSingleFlight(redis_lock=False, lock_ttl_s=5)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    async def main():
+        first = asyncio.create_task(single_flight.do("service:a", loader))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(single_flight.do("service:a", loader))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "value"
+    assert len(calls) == 1
+
+def test_waiting_for_another_worker_does_not_block_the_event_loop(fake_redis):
+    single_flight = AsyncSingleFlight(redis_lock=True, lock_ttl_s=5)
+    # Another worker holds the lock and fills the cache after a while
+    fake_redis.set("Dhruva:lock:service:a", 1)
+
+    def recheck():
+        value = fake_redis.get("service:a")
+        if value is None:
+            raise KeyError("service:a")
+        return value
+
+    async def other_worker():
+        await asyncio.sleep(0.2)
+        fake_redis.set("service:a", "value")
+
+    async def ticker():
+        ticks = 0
+        while fake_redis.get("service:a") is None:
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return ticks
+
+    async def main():
+        return await asyncio.gather(
+            single_flight.do("service:a", lambda: "loaded", recheck=recheck),
+            other_worker(),
+            ticker(),
+        )
+
+    result, _, ticks = asyncio.run(main())
+
+    assert result == "value"
+    assert ticks > 5
@@ -0,0 +1,41 @@
+from cache.invalidation import publish_invalidation
+from cache.lfu_cache import LFUCache
+from module.services.service.inference_service import transliteration_memo
+
+
+def memo_key(service_id: str, word: str):
+    return (service_id, "1.0", "en", "hi", None, word)
+
+
+def test_service_invalidation_drops_only_its_memo_entries(fake_redis):
+    transliteration_memo.set(memo_key("ai4bharat/first", "namaste"), "नमस्ते")
+    transliteration_memo.set(memo_key("ai4bharat/second", "namaste"), "नमस्ते")
+
+    publish_invalidation("service", "ai4bharat/first")
+
+    assert transliteration_memo.get(memo_key("ai4bharat/first", "namaste")) is None
+    assert transliteration_memo.get(memo_key("ai4bharat/second", "namaste"))
+
+
+def test_model_invalidation_clears_the_memo(fake_redis):
+    transliteration_memo.set(memo_key("ai4bharat/first", "namaste"), "नमस्ते")
+
+    publish_invalidation("model", "ai4bharat/indicxlit")
+
+    assert len(transliteration_memo) == 0
+
+
+def test_lfu_cache_keeps_evicting_after_deletes():
+    lfu_cache = LFUCache(max_size=2)
+    lfu_cache.set("a", 1)
+    lfu_cache.get("a")
+    lfu_cache.set("b", 2)
+
+    lfu_cache.delete_where(lambda key: key == "b")
+    lfu_cache.set("c", 3)
+    lfu_cache.set("d", 4)
+
+    assert len(lfu_cache) == 2
+    assert lfu_cache.get("a") == 1
+    assert lfu_cache.get("c") is None
+    assert lfu_cache.get("d") == 4
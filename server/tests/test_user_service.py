@@ -0,0 +1,23 @@
+from unittest.mock import MagicMock
+
+from bson import ObjectId
+
+from auth.auth_token_provider import session_local_cache
+from module.auth.service.user_service import UserService
+
+
+def test_modify_user_evicts_all_of_their_cached_sessions(fake_redis):
+    user_id, other_user_id = ObjectId(), ObjectId()
+    for sess_id in ("first", "second"):
+        session_local_cache.set((str(user_id), sess_id), {"role": "CONSUMER"})
+    session_local_cache.set((str(other_user_id), "third"), {"role": "CONSUMER"})
+
+    user_repository = MagicMock()
+    user_repository.get_by_id.return_value = MagicMock(id=user_id)
+    user_service = UserService(user_repository, MagicMock())
+
+    user_service.modify_user(MagicMock(password=None, name="Renamed"), user_id)
+
+    assert session_local_cache.get((str(user_id), "first")) is None
+    assert session_local_cache.get((str(user_id), "second")) is None
+    assert session_local_cache.get((str(other_user_id), "third")) is not None
@@ -0,0 +1,112 @@
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from bson import ObjectId
+
+from cache import warm_up
+from cache.invalidation import (
+    INVALIDATION_CHANNEL,
+    invalidation_callbacks,
+    on_invalidation,
+)
+from module.services.model import Service
+from module.services.service.inference_service import service_local_cache
+
+
+def mock_repositories(monkeypatch, services):
+    for name, documents in (
+        ("ServiceRepository", services),
+        ("ModelRepository", []),
+        ("ApiKeyRepository", []),
+    ):
+        repository = MagicMock()
+        repository.find_all.return_value = documents
+        repository.find.return_value = documents
+        monkeypatch.setattr(warm_up, name, lambda db, repository=repository: repository)
+
+
+def make_service(service_id: str):
+    return Service(
+        _id=ObjectId(),
+        serviceId=service_id,
+        name="IndicTrans",
+        serviceDescription="Translation",
+        hardwareDescription="T4",
+        publishedOn=1,
+        modelId="indictrans-v2",
+        endpoint="triton.example.com",
+        api_key="secret",
+    )
+
+
+@pytest.fixture
+def start_cache(fake_redis):
+    """Starts the cache like a worker does and stops its listener afterwards"""
+
+    stops = []
+    yield lambda db: stops.append(warm_up.start_cache(db))
+    for stop in stops:
+        stop()
+
+
+@pytest.fixture
+def service_invalidations():
+    """Sets an event for every service id invalidated in this worker"""
+
+    invalidated = {}
+
+    def callback(key):
+        invalidated.setdefault(key, threading.Event()).set()
+
+    on_invalidation("service", callback)
+    yield lambda key: invalidated.setdefault(key, threading.Event())
+    invalidation_callbacks["service"].remove(callback)
+
+
+def test_local_cache_is_warm_after_startup(start_cache, monkeypatch):
+    service_id = "ai4bharat/warm-up-test"
+    mock_repositories(monkeypatch, [make_service(service_id)])
+
+    start_cache(MagicMock())
+
+    assert service_local_cache.get(service_id) is not None
+
+
+def test_invalidations_from_other_workers_evict_warm_entries(
+    start_cache, service_invalidations, fake_redis, monkeypatch
+):
+    service_id = "ai4bharat/warm-up-invalidation-test"
+    mock_repositories(monkeypatch, [make_service(service_id)])
+
+    start_cache(MagicMock())
+    fake_redis.publish(
+        INVALIDATION_CHANNEL, json.dumps({"cache": "service", "key": service_id})
+    )
+
+    assert service_invalidations(service_id).wait(timeout=2)
+    assert service_local_cache.get(service_id) is None
+
+
+def test_only_one_worker_reads_mongo(fake_redis, monkeypatch):
+    service_id = "ai4bharat/warm-up-once-test"
+    mock_repositories(monkeypatch, [make_service(service_id)])
+    find_all = warm_up.ServiceRepository(None).find_all
+
+    warm_up.warm_up_cache(MagicMock())
+    warm_up.warm_up_cache(MagicMock())
+
+    assert find_all.call_count == 1
+    assert not fake_redis.exists(warm_up.WARM_UP_LOCK_KEY)
+
+
+def test_failed_warm_up_releases_the_lock(fake_redis, monkeypatch):
+    mock_repositories(monkeypatch, [])
+    warm_up.ServiceRepository(None).find_all.side_effect = ConnectionError
+
+    with pytest.raises(ConnectionError):
+        warm_up.warm_up_cache(MagicMock())
+
+    assert not fake_redis.exists(warm_up.WARM_UP_LOCK_KEY)
+    assert not fake_redis.exists(warm_up.WARM_UP_DONE_KEY)